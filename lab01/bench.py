@@ -0,0 +1,206 @@
+import os
+import random
+import re
+import string
+import sys
+import time
+
+from main import (DEFAULT_FULLNAME, DEFAULT_BIRTHDAY, COMMON_WORDS, PasswordAuditor, analyze_password,
+                  leet_normalize, parallel_analyze, split_name_parts)
+from incremental import IncrementalScorer
+
+ALPHABET = string.ascii_letters + string.digits + "!@#$%_-."
+
+
+def make_passwords(n, seed=42):
+    """Синтетичний набір паролів: випадкові, з ім'ям, датою, leet-варіантами та словниковими словами."""
+    rnd = random.Random(seed)
+    extras = ["khalina", "kh4l1n4", "olha", "0lha", "1005", "2005", "10052005", "1234"] + sorted(COMMON_WORDS)
+    out = []
+    for _ in range(n):
+        pw = "".join(rnd.choice(ALPHABET) for _ in range(rnd.randint(6, 16)))
+        if rnd.random() < 0.3:
+            pos = rnd.randint(0, len(pw))
+            pw = pw[:pos] + rnd.choice(extras) + pw[pos:]
+        out.append(pw)
+    return out
+
+
+def legacy_analyze(password: str, fullname: str, birthday: str):
+    # Попередня реалізація analyze_password: усі перевірки заново для кожного пароля
+    pw = password.strip()
+    lower_pw = pw.lower()
+    score = 10.0
+    deductions = []  # список: (причина, -бали)
+    recommendations = []
+
+    # --- Персональні дані ---
+    name_parts = split_name_parts(fullname)
+    for part in name_parts:
+        if part and part in lower_pw:
+            deductions.append((f"Знайдено ім'я/прізвище '{part}'", -3.0))
+            recommendations.append("Не використовуйте ім'я або прізвище у паролі.")
+    leet_pw = leet_normalize(pw)
+    for part in name_parts:
+        if part and part in leet_pw and part not in lower_pw:
+            deductions.append((f"Знайдено leet-варіант імені '{part}'", -3.0))
+            recommendations.append("Не використовуйте модифіковане ім'я у паролі.")
+
+    bd_parts = re.findall(r"\d+", birthday)
+    if len(bd_parts) >= 3:
+        dd, mm, yyyy = bd_parts[0], bd_parts[1], bd_parts[2]
+        bd_formats = {dd, mm, yyyy, yyyy[-2:], dd+mm, dd+mm+yyyy, mm+dd, birthday.replace(".", "")}
+        for form in bd_formats:
+            if form and form in lower_pw:
+                deductions.append((f"Знайдено частину дати народження '{form}'", -3.0))
+                recommendations.append("Не використовуйте дату народження у паролі.")
+
+    # --- Довжина ---
+    L = len(pw)
+    if L < 8:
+        deductions.append(("Довжина < 8 символів", -2.0))
+        recommendations.append("Зробіть пароль хоча б 12 символів.")
+    elif 8 <= L < 12:
+        deductions.append(("Довжина 8–11 символів", -0.5))
+        recommendations.append("Подовжіть пароль до 12+ символів.")
+    else:
+        score += 0.5
+
+    # --- Різноманітність символів ---
+    if not re.search(r"[A-ZА-ЯІЇЄҐ]", pw):
+        deductions.append(("Відсутні великі літери", -0.8))
+        recommendations.append("Додайте великі літери.")
+    if not re.search(r"[a-zа-яіїєґ]", pw):
+        deductions.append(("Відсутні маленькі літери", -0.8))
+        recommendations.append("Додайте маленькі літери.")
+    if not re.search(r"\d", pw):
+        deductions.append(("Відсутні цифри", -0.8))
+        recommendations.append("Додайте цифри.")
+    if not re.search(r"[^A-Za-zА-Яа-яІЇЄҐіїєґ0-9]", pw):
+        deductions.append(("Відсутні спеціальні символи", -1.0))
+        recommendations.append("Додайте спецсимволи (!@#$%).")
+    else:
+        score += 0.2
+
+    # --- Словникові слова ---
+    found_common = [w for w in COMMON_WORDS if w in lower_pw]
+    if found_common:
+        deductions.append((f"Містить поширене слово: {', '.join(found_common)}", -2.0))
+        recommendations.append("Уникайте простих словникових слів.")
+
+    # --- Послідовності ---
+    if re.search(r"(0123|1234|2345|3456|4567|5678|6789)", pw):
+        deductions.append(("Містить цифрову послідовність (наприклад, 1234)", -1.0))
+        recommendations.append("Не використовуйте послідовності цифр чи букв.")
+
+    # --- Підрахунок фінальних балів ---
+    for reason, penalty in deductions:
+        score += penalty
+
+    score = max(1.0, min(10.0, score))
+
+    if score <= 3: level = "Дуже слабкий"
+    elif score <= 5: level = "Слабкий"
+    elif score <= 7: level = "Середній"
+    elif score <= 9: level = "Сильний"
+    else: level = "Надійний"
+
+    return {
+        "password": pw,
+        "score": round(score, 1),
+        "level": level,
+        "deductions": deductions,
+        "recommendations": list(dict.fromkeys(recommendations))
+    }
+
+
+def canonical(result):
+    """
+    Результат без залежності від порядку: стара реалізація обходить множини
+    (формати дати, COMMON_WORDS), тож порядок штрафів змінюється між запусками.
+    """
+    deductions = []
+    for reason, penalty in result["deductions"]:
+        prefix, sep, words = reason.partition(": ")
+        if prefix == "Містить поширене слово":
+            reason = prefix + sep + ", ".join(sorted(words.split(", ")))
+        deductions.append((reason, penalty))
+    return {**result, "deductions": sorted(deductions), "recommendations": sorted(result["recommendations"])}
+
+
+def bench(n=50000):
+    passwords = make_passwords(n)
+
+    t0 = time.perf_counter()
+    baseline = [legacy_analyze(pw, DEFAULT_FULLNAME, DEFAULT_BIRTHDAY) for pw in passwords]
+    t1 = time.perf_counter()
+    auditor = PasswordAuditor(DEFAULT_FULLNAME, DEFAULT_BIRTHDAY)
+    batch = list(auditor.analyze_many(passwords))
+    t2 = time.perf_counter()
+
+    if any(canonical(old) != canonical(new) for old, new in zip(baseline, batch)):
+        print("ПОМИЛКА: результати PasswordAuditor відрізняються від попередньої реалізації")
+        sys.exit(1)
+
+    per_call = n / (t1 - t0)
+    batched = n / (t2 - t1)
+    print(f"Паролів: {n}")
+    print(f"legacy_analyze:   {per_call:,.0f} паролів/с")
+    print(f"PasswordAuditor:  {batched:,.0f} паролів/с  (x{batched / per_call:.1f})")
+
+
+def bench_scaling(n=200000, max_workers=None):
+    """Масштабування parallel_analyze від 1 до max_workers процесів."""
+    passwords = make_passwords(n)
+    max_workers = max_workers or os.cpu_count() or 1
+    reference = None
+    print(f"Паролів: {n}, ядер: {os.cpu_count()}")
+    workers = 1
+    while True:
+        for ordered in (True, False):
+            t0 = time.perf_counter()
+            results = list(parallel_analyze(passwords, DEFAULT_FULLNAME, DEFAULT_BIRTHDAY,
+                                            workers=workers, ordered=ordered))
+            elapsed = time.perf_counter() - t0
+            if ordered:
+                reference = reference or results
+                if results != reference:
+                    print("ПОМИЛКА: порядок або вміст результатів відрізняється")
+                    sys.exit(1)
+            mode = "впорядковано" if ordered else "без порядку"
+            print(f"процесів={workers:<3} {mode:<13} {n / elapsed:>12,.0f} паролів/с")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+
+def bench_keystroke(n=2000):
+    """Затримка на одне натискання клавіші: повний перерахунок проти IncrementalScorer."""
+    passwords = [pw * 3 for pw in make_passwords(n)]  # довші паролі, як у фразах-паролях
+    keystrokes = sum(len(pw) for pw in passwords)
+
+    t0 = time.perf_counter()
+    for pw in passwords:
+        for i in range(1, len(pw) + 1):
+            analyze_password(pw[:i], DEFAULT_FULLNAME, DEFAULT_BIRTHDAY)
+    t1 = time.perf_counter()
+    scorer = IncrementalScorer(DEFAULT_FULLNAME, DEFAULT_BIRTHDAY)
+    for pw in passwords:
+        scorer.set_text("")
+        for ch in pw:
+            scorer.append(ch)
+            scorer.result()
+    t2 = time.perf_counter()
+
+    print(f"Натискань клавіш: {keystrokes}")
+    print(f"analyze_password:  {(t1 - t0) / keystrokes * 1e6:.1f} мкс/натискання")
+    print(f"IncrementalScorer: {(t2 - t1) / keystrokes * 1e6:.1f} мкс/натискання")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--scaling":
+        bench_scaling(int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
+    elif len(sys.argv) > 1 and sys.argv[1] == "--keystroke":
+        bench_keystroke(int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
+    else:
+        bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
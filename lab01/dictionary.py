@@ -0,0 +1,221 @@
+"""
+Компактний індекс великого словника зламаних паролів.
+
+Текстовий список (один пароль на рядок) один раз перетворюється у бінарний
+файл, який далі відкривається через mmap без повторного розбору тексту:
+
+    заголовок | фільтр Блума | зміщення (uint64, count+1) | слова (utf-8 підряд)
+
+Слова відсортовані, тому точна перевірка — двійковий пошук по зміщеннях.
+Фільтр Блума відсікає більшість відсутніх слів без звернення до масиву,
+що робить дешевою перевірку всіх підрядків пароля (пошук вбудованих слів).
+"""
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+
+MAGIC = b"PWDIDX01"
+HEADER = struct.Struct("<8sQQIII")  # magic, count, bloom_bits, bloom_k, min_len, max_len
+EMBEDDED_MIN_LEN = 6   # коротші вбудовані слова є майже в кожному паролі великого словника
+MAX_EMBEDDED = 3       # скільки вбудованих слів повідомляти
+BITS_PER_WORD = 10
+BLOOM_K = 7
+SORT_CHUNK = 1_000_000  # слів в одному відсортованому блоці при побудові
+
+
+def _bloom_positions(word: bytes, bits: int, k: int):
+    digest = hashlib.blake2b(word, digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(k)]
+
+
+def _sorted_runs(lines, min_len, tmpdir):
+    """Зовнішнє сортування: ділить вхід на відсортовані блоки у тимчасових файлах."""
+    runs = []
+    total = 0
+    chunk = set()
+
+    def flush():
+        run = tempfile.TemporaryFile(dir=tmpdir)
+        for word in sorted(chunk):
+            run.write(word + b"\n")
+        run.seek(0)
+        runs.append(run)
+        chunk.clear()
+
+    for line in lines:
+        word = line.strip().lower()
+        # Керівні символи порушили б порядок злиття рядків (b"\n" як роздільник)
+        if len(word) < min_len or not word.isprintable():
+            continue
+        chunk.add(word.encode("utf-8"))
+        total += 1
+        if len(chunk) >= SORT_CHUNK:
+            flush()
+    if chunk:
+        flush()
+    return runs, total
+
+
+def build_index(text_path, index_path, min_len=4):
+    """Будує бінарний індекс index_path з текстового списку text_path (один раз)."""
+    tmpdir = os.path.dirname(os.path.abspath(index_path))
+    with open(text_path, "r", encoding="utf-8", errors="ignore") as src:
+        runs, total = _sorted_runs(src, min_len, tmpdir)
+
+    bloom_bits = max(64, total * BITS_PER_WORD)
+    bloom = bytearray((bloom_bits + 7) // 8)
+    offsets = tempfile.TemporaryFile(dir=tmpdir)
+    blob = tempfile.TemporaryFile(dir=tmpdir)
+    count = 0
+    offset = 0
+    max_len = 0
+    previous = None
+    batch = array("Q", [0])
+    try:
+        for line in heapq.merge(*runs):
+            word = line[:-1]
+            if word == previous:
+                continue
+            previous = word
+            blob.write(word)
+            offset += len(word)
+            batch.append(offset)
+            if len(batch) >= 65536:
+                batch.tofile(offsets)
+                batch = array("Q")
+            for pos in _bloom_positions(word, bloom_bits, BLOOM_K):
+                bloom[pos >> 3] |= 1 << (pos & 7)
+            max_len = max(max_len, len(word.decode("utf-8")))
+            count += 1
+        batch.tofile(offsets)
+
+        with open(index_path, "wb") as out:
+            out.write(HEADER.pack(MAGIC, count, bloom_bits, BLOOM_K, min_len, max_len))
+            out.write(bloom)
+            for part in (offsets, blob):
+                part.seek(0)
+                while True:
+                    data = part.read(1 << 20)
+                    if not data:
+                        break
+                    out.write(data)
+    finally:
+        offsets.close()
+        blob.close()
+        for run in runs:
+            run.close()
+    return count
+
+
+def pick_embedded(candidates, limit=MAX_EMBEDDED):
+    """
+    З кандидатів (довші першими) вибирає до limit слів, пропускаючи ті,
+    що є частиною вже вибраного слова.
+    """
+    picked = []
+    for word in candidates:
+        if not any(word in longer for longer in picked):
+            picked.append(word)
+            if len(picked) >= limit:
+                break
+    return picked
+
+
+class BreachDictionary:
+    """
+    Словник, відкритий через mmap: точний збіг і пошук вбудованих слів.
+    embedded_min_len — мінімальна довжина вбудованого слова (окремо від фільтра при побудові).
+    """
+
+    def __init__(self, index_path, embedded_min_len=EMBEDDED_MIN_LEN):
+        self.path = index_path
+        self._file = open(index_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.bloom_bits, self.bloom_k, self.min_len, self.max_len = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{index_path}: не є індексом словника")
+        self._bloom_start = HEADER.size
+        self._offsets_start = self._bloom_start + (self.bloom_bits + 7) // 8
+        self._blob_start = self._offsets_start + 8 * (self.count + 1)
+        self.embedded_min_len = max(self.min_len, embedded_min_len)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def _maybe_contains(self, word: bytes):
+        # Позиції рахуються ліниво: для відсутніх слів зазвичай вистачає 1–2 бітів
+        mm = self._mm
+        start = self._bloom_start
+        bits = self.bloom_bits
+        digest = hashlib.blake2b(word, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.bloom_k):
+            pos = (h1 + i * h2) % bits
+            if not mm[start + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def _word_at(self, i):
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets_start + 8 * i)
+        return self._mm[self._blob_start + start:self._blob_start + end]
+
+    def _lookup(self, word: bytes):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_at(mid) < word:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self.count and self._word_at(lo) == word
+
+    def __contains__(self, word):
+        data = word.lower().encode("utf-8")
+        return self._maybe_contains(data) and self._lookup(data)
+
+    def find_embedded(self, lower_pw: str, limit=MAX_EMBEDDED):
+        """
+        Найдовші слова словника (не коротші за embedded_min_len), що є підрядками
+        пароля: до limit слів, без тих, що входять у вже знайдені (див. pick_embedded).
+        Пароль уже в нижньому регістрі.
+        """
+        found = []
+        n = len(lower_pw)
+        for size in range(min(self.max_len, n), self.embedded_min_len - 1, -1):
+            for start in range(n - size + 1):
+                sub = lower_pw[start:start + size]
+                if any(sub in longer for longer in found):
+                    continue
+                data = sub.encode("utf-8")
+                if self._maybe_contains(data) and self._lookup(data):
+                    found.append(sub)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+
+def main(argv):
+    if len(argv) < 3 or argv[0] != "build":
+        print("Використання: python dictionary.py build <список.txt> <індекс.idx> [мін_довжина]")
+        sys.exit(1)
+    min_len = int(argv[3]) if len(argv) > 3 else 4
+    count = build_index(argv[1], argv[2], min_len)
+    print(f"✓ Індекс {argv[2]} створено: {count} слів")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
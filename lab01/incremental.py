@@ -0,0 +1,189 @@
+"""
+Інкрементальна оцінка пароля під час введення (поле форми реєстрації).
+
+Стан зберігається як стек по одному запису на символ: лічильники класів
+символів, стан автомата Ахо–Корасік для персональних токенів і словникових
+слів, знайдені цифрові послідовності та слова зі словника зламаних паролів,
+що закінчуються на цьому символі. Додавання символу просуває автомати на
+один крок, видалення просто знімає запис зі стеку — повторно весь пароль
+не перевіряється. Результат збігається з analyze_password.
+"""
+from collections import Counter
+
+from dictionary import pick_embedded
+from main import (COMMON_WORDS, DIGIT_RE, LEET_TABLE, LOWER_RE, SPECIAL_RE, UPPER_RE,
+                  PasswordAuditor, birthday_formats, evaluate_rules, split_name_parts)
+
+CLASS_RES = (("upper", UPPER_RE), ("lower", LOWER_RE), ("digit", DIGIT_RE), ("special", SPECIAL_RE))
+SEQUENCES = ("0123", "1234", "2345", "3456", "4567", "5678", "6789")
+
+
+class TokenAutomaton:
+    """Автомат Ахо–Корасік: step() повертає новий стан і токени, що закінчилися на символі."""
+
+    def __init__(self, tokens):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for token in dict.fromkeys(t for t in tokens if t):
+            state = 0
+            for ch in token:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] = self.out[state] + (token,)
+
+        # Обхід у ширину: посилання невдачі та успадковані виходи
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def step(self, state, ch):
+        goto, fail = self.goto, self.fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        return state, self.out[state]
+
+
+class IncrementalScorer:
+    """
+    Оцінка пароля, що оновлюється посимвольно: append() / pop() / set_text().
+    Кожне оновлення — O(довжина найдовшого токена), а не O(довжина × правила).
+    """
+
+    def __init__(self, fullname: str, birthday: str, dictionary=None):
+        self.name_parts = split_name_parts(fullname)
+        self.bd_formats = birthday_formats(birthday)
+        self.common_words = sorted(COMMON_WORDS)
+        self.dictionary = dictionary
+        self._auditor = PasswordAuditor(fullname, birthday, dictionary)
+        self._plain = TokenAutomaton(self.name_parts + self.bd_formats + self.common_words)
+        self._leet = TokenAutomaton(self.name_parts)
+
+        self._chars = []
+        # Запис стеку: (стан plain, стан leet, токени plain, токени leet,
+        #               класи символу, чи закінчилась послідовність, слова словника)
+        self._stack = []
+        self._lower = []
+        self._plain_hits = Counter()
+        self._leet_hits = Counter()
+        self._classes = Counter()
+        self._sequences = 0
+
+    @property
+    def text(self):
+        return "".join(self._chars)
+
+    def __len__(self):
+        return len(self._chars)
+
+    @staticmethod
+    def _char_classes(ch):
+        # Класи не взаємовиключні: напр. арабська цифра — і \d, і спецсимвол
+        return tuple(name for name, regex in CLASS_RES if regex.match(ch))
+
+    def _push(self, ch):
+        plain_state, leet_state = self._stack[-1][:2] if self._stack else (0, 0)
+        plain_found, leet_found = [], []
+        # lower() може дати більше одного символу — автомати отримують усі
+        lowered = ch.lower()
+        for lc in lowered:
+            plain_state, out = self._plain.step(plain_state, lc)
+            plain_found.extend(out)
+            leet_state, out = self._leet.step(leet_state, lc.translate(LEET_TABLE))
+            leet_found.extend(out)
+        if plain_found:
+            self._plain_hits.update(plain_found)
+        if leet_found:
+            self._leet_hits.update(leet_found)
+
+        char_classes = self._char_classes(ch)
+        for name in char_classes:
+            self._classes[name] += 1
+        self._chars.append(ch)
+        self._lower.append(lowered)
+
+        tail = "".join(self._chars[-4:])
+        is_sequence = tail in SEQUENCES
+        self._sequences += is_sequence
+
+        breached = ()
+        if self.dictionary is not None:
+            # Лише слова, що закінчуються на новому символі
+            lower_pw = "".join(self._lower[-self.dictionary.max_len:])
+            n = len(lower_pw)
+            breached = tuple(lower_pw[n - size:] for size in range(self.dictionary.embedded_min_len, n + 1)
+                             if lower_pw[n - size:] in self.dictionary)
+
+        self._stack.append((plain_state, leet_state, plain_found, leet_found,
+                            char_classes, is_sequence, breached))
+
+    def append(self, text):
+        for ch in text:
+            self._push(ch)
+
+    def pop(self, count=1):
+        for _ in range(min(count, len(self._chars))):
+            _, _, plain_found, leet_found, char_classes, is_sequence, _ = self._stack.pop()
+            if plain_found:
+                self._plain_hits.subtract(plain_found)
+            if leet_found:
+                self._leet_hits.subtract(leet_found)
+            for name in char_classes:
+                self._classes[name] -= 1
+            self._sequences -= is_sequence
+            self._chars.pop()
+            self._lower.pop()
+
+    def set_text(self, text):
+        """Довільна правка поля: знімає символи до спільного префікса і дописує решту."""
+        common = 0
+        for old, new in zip(self._chars, text):
+            if old != new:
+                break
+            common += 1
+        self.pop(len(self._chars) - common)
+        self.append(text[common:])
+
+    def _breached_words(self):
+        # Той самий порядок, що й у BreachDictionary.find_embedded: довші першими, далі за позицією
+        first = {}
+        end = 0
+        for entry in self._stack:
+            end += 1
+            for word in entry[6]:
+                first.setdefault(word, end - len(word))
+        return pick_embedded(sorted(first, key=lambda w: (-len(w), first[w])))
+
+    def result(self):
+        pw = self.text
+        if pw != pw.strip():
+            # Пробіли на краях analyze_password відкидає — рідкий випадок, рахуємо повністю
+            return self._auditor.analyze(pw)
+
+        exact_breached = self.dictionary is not None and pw.lower() in self.dictionary
+        breached = self._breached_words() if self.dictionary is not None and not exact_breached else []
+        classes = tuple(self._classes[name] > 0 for name in ("upper", "lower", "digit", "special"))
+        return evaluate_rules(
+            pw,
+            [part for part in self.name_parts if self._plain_hits[part] > 0],
+            [part for part in self.name_parts if self._leet_hits[part] > 0 and self._plain_hits[part] <= 0],
+            [form for form in self.bd_formats if self._plain_hits[form] > 0],
+            classes,
+            [w for w in self.common_words if self._plain_hits[w] > 0],
+            breached,
+            self._sequences > 0,
+            exact_breached,
+        )
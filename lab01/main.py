@@ -1,5 +1,14 @@
+import argparse
+import csv
+import json
+import os
 import re
 import sys
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from dictionary import BreachDictionary
 
 DEFAULT_FULLNAME = "Khalina Olha Dmytriyivna"
 DEFAULT_BIRTHDAY = "10.05.2005"
@@ -15,33 +24,45 @@ def leet_normalize(s: str):
 
 COMMON_WORDS = {"password", "qwerty", "admin", "user", "letmein", "welcome", "123456", "iloveyou"}
 
-def analyze_password(password: str, fullname: str, birthday: str):
-    pw = password.strip()
-    lower_pw = pw.lower()
+def birthday_formats(birthday: str):
+    bd_parts = re.findall(r"\d+", birthday)
+    if len(bd_parts) < 3:
+        return []
+    dd, mm, yyyy = bd_parts[0], bd_parts[1], bd_parts[2]
+    # Фіксований порядок без повторів: результат однаковий у будь-якому процесі
+    return list(dict.fromkeys([dd, mm, yyyy, yyyy[-2:], dd+mm, dd+mm+yyyy, mm+dd, birthday.replace(".", "")]))
+
+def score_level(score: float):
+    if score <= 3: return "Дуже слабкий"
+    elif score <= 5: return "Слабкий"
+    elif score <= 7: return "Середній"
+    elif score <= 9: return "Сильний"
+    else: return "Надійний"
+
+def evaluate_rules(pw: str, name_hits, leet_hits, birthday_hits, classes, common_hits, breached, has_sequence,
+                   exact_breached=False):
+    """
+    Правила оцінки пароля за вже знайденими збігами — спільні для analyze_password,
+    PasswordAuditor та IncrementalScorer (тексти причин і ваги лише тут).
+    name_hits / leet_hits / birthday_hits — знайдені частини імені (звичайні та лише в leet-формі)
+    і формати дати; classes — (є великі, є маленькі, є цифри, є спецсимволи);
+    common_hits — поширені слова; breached — найдовші слова словника зламаних паролів у паролі;
+    exact_breached — сам пароль є у словнику (тоді штраф за вбудовані слова не додається).
+    """
     score = 10.0
     deductions = []  # список: (причина, -бали)
     recommendations = []
 
     # --- Персональні дані ---
-    name_parts = split_name_parts(fullname)
-    for part in name_parts:
-        if part and part in lower_pw:
-            deductions.append((f"Знайдено ім'я/прізвище '{part}'", -3.0))
-            recommendations.append("Не використовуйте ім'я або прізвище у паролі.")
-    leet_pw = leet_normalize(pw)
-    for part in name_parts:
-        if part and part in leet_pw and part not in lower_pw:
-            deductions.append((f"Знайдено leet-варіант імені '{part}'", -3.0))
-            recommendations.append("Не використовуйте модифіковане ім'я у паролі.")
-
-    bd_parts = re.findall(r"\d+", birthday)
-    if len(bd_parts) >= 3:
-        dd, mm, yyyy = bd_parts[0], bd_parts[1], bd_parts[2]
-        bd_formats = {dd, mm, yyyy, yyyy[-2:], dd+mm, dd+mm+yyyy, mm+dd, birthday.replace(".", "")}
-        for form in bd_formats:
-            if form and form in lower_pw:
-                deductions.append((f"Знайдено частину дати народження '{form}'", -3.0))
-                recommendations.append("Не використовуйте дату народження у паролі.")
+    for part in name_hits:
+        deductions.append((f"Знайдено ім'я/прізвище '{part}'", -3.0))
+        recommendations.append("Не використовуйте ім'я або прізвище у паролі.")
+    for part in leet_hits:
+        deductions.append((f"Знайдено leet-варіант імені '{part}'", -3.0))
+        recommendations.append("Не використовуйте модифіковане ім'я у паролі.")
+    for form in birthday_hits:
+        deductions.append((f"Знайдено частину дати народження '{form}'", -3.0))
+        recommendations.append("Не використовуйте дату народження у паролі.")
 
     # --- Довжина ---
     L = len(pw)
@@ -55,29 +76,35 @@ def analyze_password(password: str, fullname: str, birthday: str):
         score += 0.5
 
     # --- Різноманітність символів ---
-    if not re.search(r"[A-ZА-ЯІЇЄҐ]", pw):
+    has_upper, has_lower, has_digit, has_special = classes
+    if not has_upper:
         deductions.append(("Відсутні великі літери", -0.8))
         recommendations.append("Додайте великі літери.")
-    if not re.search(r"[a-zа-яіїєґ]", pw):
+    if not has_lower:
         deductions.append(("Відсутні маленькі літери", -0.8))
         recommendations.append("Додайте маленькі літери.")
-    if not re.search(r"\d", pw):
+    if not has_digit:
         deductions.append(("Відсутні цифри", -0.8))
         recommendations.append("Додайте цифри.")
-    if not re.search(r"[^A-Za-zА-Яа-яІЇЄҐіїєґ0-9]", pw):
+    if not has_special:
         deductions.append(("Відсутні спеціальні символи", -1.0))
         recommendations.append("Додайте спецсимволи (!@#$%).")
     else:
         score += 0.2
 
     # --- Словникові слова ---
-    found_common = [w for w in COMMON_WORDS if w in lower_pw]
+    found_common = list(common_hits)
+    if not exact_breached:
+        found_common += [w for w in breached if w not in common_hits]
     if found_common:
         deductions.append((f"Містить поширене слово: {', '.join(found_common)}", -2.0))
         recommendations.append("Уникайте простих словникових слів.")
+    if exact_breached:
+        deductions.append(("Пароль знайдено у словнику зламаних паролів", -3.0))
+        recommendations.append("Не використовуйте паролі, що вже траплялися у витоках.")
 
     # --- Послідовності ---
-    if re.search(r"(0123|1234|2345|3456|4567|5678|6789)", pw):
+    if has_sequence:
         deductions.append(("Містить цифрову послідовність (наприклад, 1234)", -1.0))
         recommendations.append("Не використовуйте послідовності цифр чи букв.")
 
@@ -87,20 +114,222 @@ def analyze_password(password: str, fullname: str, birthday: str):
 
     score = max(1.0, min(10.0, score))
 
-    if score <= 3: level = "Дуже слабкий"
-    elif score <= 5: level = "Слабкий"
-    elif score <= 7: level = "Середній"
-    elif score <= 9: level = "Сильний"
-    else: level = "Надійний"
-
     return {
         "password": pw,
         "score": round(score, 1),
-        "level": level,
+        "level": score_level(score),
         "deductions": deductions,
         "recommendations": list(dict.fromkeys(recommendations))
     }
 
+def analyze_password(password: str, fullname: str, birthday: str, dictionary=None):
+    return PasswordAuditor(fullname, birthday, dictionary).analyze(password)
+
+# --- Пакетний аудит ---
+UPPER_RE = re.compile(r"[A-ZА-ЯІЇЄҐ]")
+LOWER_RE = re.compile(r"[a-zа-яіїєґ]")
+DIGIT_RE = re.compile(r"\d")
+SPECIAL_RE = re.compile(r"[^A-Za-zА-Яа-яІЇЄҐіїєґ0-9]")
+SEQUENCE_RE = re.compile(r"(0123|1234|2345|3456|4567|5678|6789)")
+LEET_TABLE = str.maketrans(LEET_MAP)
+
+def _tokens_regex(tokens):
+    # Одна альтернатива на всі токени: довші першими, щоб автомат не зупинявся на префіксі
+    tokens = sorted({t for t in tokens if t}, key=len, reverse=True)
+    if not tokens:
+        return None
+    return re.compile("|".join(re.escape(t) for t in tokens))
+
+class PasswordAuditor:
+    """
+    Аудитор для перевірки великої кількості паролів однієї людини.
+    Частини імені, формати дати народження та словникові слова обчислюються
+    один раз і компілюються в regex-автомати. Автомат працює як швидкий фільтр:
+    точні перевірки (і тексти зняття балів) виконуються лише для паролів,
+    у яких знайдено збіг. Результат такий самий, як у analyze_password.
+    """
+    def __init__(self, fullname: str, birthday: str, dictionary=None):
+        self.fullname = fullname
+        self.birthday = birthday
+        self.dictionary = dictionary
+        self.name_parts = split_name_parts(fullname)
+        self.bd_formats = birthday_formats(birthday)
+        self.common_words = sorted(COMMON_WORDS)
+        self._personal_re = _tokens_regex(self.name_parts + self.bd_formats)
+        self._name_re = _tokens_regex(self.name_parts)
+        self._common_re = _tokens_regex(self.common_words)
+
+    def analyze(self, password: str):
+        pw = password.strip()
+        lower_pw = pw.lower()
+
+        # --- Персональні дані ---
+        name_hits = leet_hits = birthday_hits = ()
+        if self._personal_re is not None and self._personal_re.search(lower_pw):
+            name_hits = [part for part in self.name_parts if part in lower_pw]
+            birthday_hits = [form for form in self.bd_formats if form in lower_pw]
+        if self._name_re:
+            leet_pw = lower_pw.translate(LEET_TABLE)
+            if leet_pw != lower_pw and self._name_re.search(leet_pw):
+                leet_hits = [part for part in self.name_parts if part in leet_pw and part not in lower_pw]
+
+        # --- Словникові слова ---
+        common_hits = []
+        if self._common_re.search(lower_pw):
+            common_hits = [w for w in self.common_words if w in lower_pw]
+        exact_breached = self.dictionary is not None and lower_pw in self.dictionary
+        breached = []
+        if self.dictionary is not None and not exact_breached:
+            breached = self.dictionary.find_embedded(lower_pw)
+
+        classes = (bool(UPPER_RE.search(pw)), bool(LOWER_RE.search(pw)),
+                   bool(DIGIT_RE.search(pw)), bool(SPECIAL_RE.search(pw)))
+        return evaluate_rules(pw, name_hits, leet_hits, birthday_hits, classes, common_hits, breached,
+                              bool(SEQUENCE_RE.search(pw)), exact_breached)
+
+    def analyze_many(self, passwords):
+        """Оцінює ітерабельну колекцію паролів, повертає генератор результатів."""
+        analyze = self.analyze
+        for pw in passwords:
+            yield analyze(pw)
+
+# --- Багатопроцесний режим ---
+_worker_auditor = None
+
+def _init_worker(fullname, birthday, dictionary_path=None):
+    # Дані особи передаються в процес один раз, а не з кожним паролем;
+    # словник кожен процес відкриває сам через mmap (спільний кеш сторінок ОС)
+    global _worker_auditor
+    dictionary = BreachDictionary(dictionary_path) if dictionary_path else None
+    _worker_auditor = PasswordAuditor(fullname, birthday, dictionary)
+
+def _analyze_chunk(passwords):
+    return [_worker_auditor.analyze(pw) for pw in passwords]
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def parallel_analyze(passwords, fullname, birthday, workers=None, chunk_size=2000, ordered=True,
+                     dictionary_path=None):
+    """
+    Оцінює паролі в пулі процесів. Вхід ділиться на блоки по chunk_size,
+    у роботі одночасно не більше 2 * workers блоків, тому пам'ять обмежена.
+    ordered=False віддає результати в порядку готовності блоків (швидше).
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    chunks = _chunks(passwords, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(fullname, birthday, dictionary_path)) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_analyze_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_analyze_chunk, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        yield from fut.result()
+            for fut in pending:
+                yield from fut.result()
+
+# --- Потоковий (неінтерактивний) режим ---
+OUTPUT_BUFFER = 1 << 20  # 1 МБ буфер запису: вивід обмежений диском, а не print()
+LEVELS = ("Дуже слабкий", "Слабкий", "Середній", "Сильний", "Надійний")
+CSV_FIELDS = ["password", "score", "level", "deductions", "recommendations"]
+
+def read_passwords(stream):
+    """Читає паролі рядок за рядком (постійна пам'ять), порожні рядки пропускає."""
+    for line in stream:
+        pw = line.rstrip("\r\n")
+        if pw.strip():
+            yield pw
+
+def write_results(results, out, fmt="jsonl"):
+    """Записує результати у JSONL або CSV, повертає гістограму рівнів."""
+    histogram = Counter()
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(CSV_FIELDS)
+        for res in results:
+            histogram[res["level"]] += 1
+            writer.writerow([
+                res["password"], res["score"], res["level"],
+                "; ".join(f"{reason}: {penalty}" for reason, penalty in res["deductions"]),
+                "; ".join(res["recommendations"]),
+            ])
+    else:
+        for res in results:
+            histogram[res["level"]] += 1
+            out.write(json.dumps(res, ensure_ascii=False))
+            out.write("\n")
+    return histogram
+
+def print_histogram(histogram, stream=sys.stderr):
+    total = sum(histogram.values())
+    print(f"Перевірено паролів: {total}", file=stream)
+    for level in LEVELS:
+        count = histogram.get(level, 0)
+        share = (count / total * 100) if total else 0.0
+        print(f" - {level:<13} {count:>10}  ({share:.2f}%)", file=stream)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Потоковий аудит паролів зі списку (файл або stdin).")
+    parser.add_argument("-i", "--input", default="-", help="файл зі списком паролів, '-' — stdin")
+    parser.add_argument("-o", "--output", default="-", help="файл результатів, '-' — stdout")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--fullname", default=DEFAULT_FULLNAME)
+    parser.add_argument("--birthday", default=DEFAULT_BIRTHDAY)
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="кількість процесів (0 — усі ядра, 1 — без пулу)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="паролів в одному блоці для процесу")
+    parser.add_argument("--unordered", action="store_true",
+                        help="записувати результати в порядку готовності, а не в порядку вводу")
+    parser.add_argument("-d", "--dictionary",
+                        help="індекс словника зламаних паролів (python dictionary.py build ...)")
+    return parser.parse_args(argv)
+
+def batch_main(argv):
+    args = parse_args(argv)
+
+    if args.input == "-":
+        sys.stdin.reconfigure(errors="replace")
+        src = sys.stdin
+    else:
+        src = open(args.input, "r", encoding="utf-8", errors="replace", buffering=OUTPUT_BUFFER)
+    if args.output == "-":
+        dst = open(sys.stdout.fileno(), "w", encoding="utf-8", newline="", buffering=OUTPUT_BUFFER, closefd=False)
+    else:
+        dst = open(args.output, "w", encoding="utf-8", newline="", buffering=OUTPUT_BUFFER)
+
+    passwords = read_passwords(src)
+    if args.workers == 1:
+        dictionary = BreachDictionary(args.dictionary) if args.dictionary else None
+        results = PasswordAuditor(args.fullname, args.birthday, dictionary).analyze_many(passwords)
+    else:
+        results = parallel_analyze(passwords, args.fullname, args.birthday,
+                                   workers=args.workers or None, chunk_size=args.chunk_size,
+                                   ordered=not args.unordered, dictionary_path=args.dictionary)
+    try:
+        histogram = write_results(results, dst, args.format)
+    finally:
+        dst.close()
+        if src is not sys.stdin:
+            src.close()
+    print_histogram(histogram)
+
 def main():
     print("=== Password Auditor ===")
     fullname = input(f"Введіть повне ім'я [{DEFAULT_FULLNAME}]: ").strip() or DEFAULT_FULLNAME
@@ -133,7 +362,10 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        if len(sys.argv) > 1:
+            batch_main(sys.argv[1:])
+        else:
+            main()
     except KeyboardInterrupt:
         print("\nПерервано користувачем.")
         sys.exit(0)
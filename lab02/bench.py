@@ -0,0 +1,70 @@
+import random
+import sys
+import time
+
+from main import AffineCipher, CaesarCipher, make_keys
+
+WORDS = ("захист", "інформації", "шифр", "ключ", "повідомлення", "лабораторна", "робота",
+         "алфавіт", "україна", "харків", "безпека", "дані", "їжак", "ґанок", "єдність")
+
+
+def make_text(size_mb=4, seed=1):
+    """Український текст розміром ~size_mb МБ (у символах), з великими літерами та розділовими знаками."""
+    rnd = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    length = 0
+    while length < target:
+        word = rnd.choice(WORDS)
+        if rnd.random() < 0.1:
+            word = word.capitalize()
+        word += rnd.choice((" ", " ", " ", ", ", ". ", "\n"))
+        parts.append(word)
+        length += len(word)
+    return "".join(parts)
+
+
+def reference_encrypt(cipher, msg, transform):
+    # Попередня реалізація: alphabet.index() для кожного символу
+    out_text = []
+    for ch in msg.lower():
+        if ch in cipher.alphabet:
+            idx = cipher.alphabet.index(ch)
+            out_text.append(cipher.alphabet[transform(idx)])
+        else:
+            out_text.append(ch)
+    return ''.join(out_text)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def bench(size_mb=4):
+    text = make_text(size_mb)
+    shift, a, b = make_keys("10.05.2005", "Халіна")
+    caesar = CaesarCipher(shift)
+    affine = AffineCipher(a, b)
+    m = affine.m
+    a_inv = pow(affine.a, -1, m)
+    cases = (
+        ("Цезар encrypt", caesar.encrypt, lambda i: (i + caesar.shift) % m),
+        ("Цезар decrypt", caesar.decrypt, lambda i: (i - caesar.shift) % m),
+        ("Афінний encrypt", affine.encrypt, lambda i: (affine.a * i + affine.b) % m),
+        ("Афінний decrypt", affine.decrypt, lambda i: (a_inv * (i - affine.b)) % m),
+    )
+    print(f"Текст: {len(text) / 1024 / 1024:.1f} М символів")
+    for name, method, transform in cases:
+        expected, t_ref = timed(reference_encrypt, caesar if "Цезар" in name else affine, text, transform)
+        result, t_new = timed(method, text)
+        if result != expected:
+            print(f"ПОМИЛКА: {name} відрізняється від попередньої реалізації")
+            sys.exit(1)
+        print(f"{name:<16} посимвольно: {size_mb / t_ref:7.1f} МБ/с   таблиця: {size_mb / t_new:8.1f} МБ/с"
+              f"  (x{t_ref / t_new:.0f})")
+
+
+if __name__ == "__main__":
+    bench(float(sys.argv[1]) if len(sys.argv) > 1 else 4)
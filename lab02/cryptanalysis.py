@@ -0,0 +1,151 @@
+"""
+Криптоаналіз шифру Цезаря та афінного шифру (m = 33) повним перебором ключів.
+
+Кандидати не розшифровуються як рядки: шифротекст один раз перетворюється
+на гістограму літер (і біграм), а розшифрування ключем (a, b) — це лише
+перестановка індексів алфавіту. Оцінки всіх ключів обчислюються однією
+операцією NumPy: сума count[c] * log P(p(c)) по всіх літерах c шифротексту.
+"""
+import math
+import sys
+import time
+
+import numpy as np
+
+from main import AffineCipher, CaesarCipher, get_alphabet
+
+ALPHABET = get_alphabet("ukrainian").letters
+M = len(ALPHABET)
+
+# Приблизна частотність літер української мови, %
+UKRAINIAN_FREQ = {
+    'а': 7.2, 'б': 1.7, 'в': 5.2, 'г': 1.6, 'ґ': 0.01, 'д': 3.5, 'е': 4.7, 'є': 0.8,
+    'ж': 0.9, 'з': 2.3, 'и': 6.1, 'і': 5.7, 'ї': 0.6, 'й': 1.4, 'к': 3.5, 'л': 3.6,
+    'м': 3.1, 'н': 6.5, 'о': 9.4, 'п': 2.9, 'р': 4.7, 'с': 4.1, 'т': 5.5, 'у': 3.9,
+    'ф': 0.3, 'х': 1.2, 'ц': 1.0, 'ч': 1.8, 'ш': 0.8, 'щ': 0.5, 'ь': 1.6, 'ю': 0.8,
+    'я': 2.9,
+}
+
+# Таблиця "кодова точка -> індекс у алфавіті" (-1 для інших символів)
+_LUT = np.full(max(map(ord, ALPHABET)) + 1, -1, dtype=np.int64)
+_LUT[[ord(ch) for ch in ALPHABET]] = np.arange(M)
+
+
+class LanguageModel:
+    """Логарифми ймовірностей літер (і, якщо навчено на корпусі, біграм)."""
+
+    def __init__(self, unigram_log, bigram_log=None):
+        self.unigram_log = unigram_log
+        self.bigram_log = bigram_log
+
+    @classmethod
+    def from_frequencies(cls, freq=UKRAINIAN_FREQ):
+        probs = np.array([freq[ch] for ch in ALPHABET], dtype=np.float64)
+        return cls(np.log(probs / probs.sum()))
+
+    @classmethod
+    def train(cls, corpus):
+        """Модель з біграмами за зразком відкритого тексту (згладжування +1)."""
+        uni, bi = letter_counts(corpus)
+        uni = uni + 1.0
+        bi = bi + 1.0
+        return cls(np.log(uni / uni.sum()), np.log(bi / bi.sum()))
+
+
+def letter_indices(text):
+    """Індекси літер алфавіту для кожного символу тексту (-1 для решти)."""
+    codes = np.frombuffer(text.lower().encode("utf-32-le"), dtype="<u4").astype(np.int64)
+    idx = np.full(codes.shape, -1, dtype=np.int64)
+    inside = codes < len(_LUT)
+    idx[inside] = _LUT[codes[inside]]
+    return idx
+
+
+def letter_counts(text):
+    """Гістограма літер (33) і сусідніх пар літер (33 x 33)."""
+    idx = letter_indices(text)
+    letters = idx[idx >= 0]
+    uni = np.bincount(letters, minlength=M).astype(np.float64)
+    pair = (idx[:-1] >= 0) & (idx[1:] >= 0)
+    bi = np.bincount(idx[:-1][pair] * M + idx[1:][pair], minlength=M * M).astype(np.float64)
+    return uni, bi.reshape(M, M)
+
+
+def affine_keys():
+    """Усі допустимі ключі (a, b) афінного шифру для m = 33: 20 x 33 = 660."""
+    return [(a, b) for a in range(1, M) if math.gcd(a, M) == 1 for b in range(M)]
+
+
+def decrypt_permutations(keys):
+    """Матриця (ключі x 33): індекс відкритої літери для кожної літери шифротексту."""
+    a = np.array([k[0] for k in keys], dtype=np.int64)[:, None]
+    b = np.array([k[1] for k in keys], dtype=np.int64)[:, None]
+    a_inv = np.array([pow(int(x), -1, M) for x in a[:, 0]], dtype=np.int64)[:, None]
+    c = np.arange(M, dtype=np.int64)[None, :]
+    return (a_inv * (c - b)) % M
+
+
+def score_keys(ciphertext, keys, model=None):
+    """Логарифмічна правдоподібність відкритого тексту для кожного ключа (більше — краще)."""
+    model = model or DEFAULT_MODEL
+    uni, bi = letter_counts(ciphertext)
+    perms = decrypt_permutations(keys)
+    if model.bigram_log is not None:
+        # bigram_log[p(c1), p(c2)] для всіх ключів одразу: (ключі x 33 x 33)
+        table = model.bigram_log[perms[:, :, None], perms[:, None, :]]
+        return (table * bi[None, :, :]).sum(axis=(1, 2))
+    return (model.unigram_log[perms] * uni[None, :]).sum(axis=1)
+
+
+def _ranked(keys, scores, top):
+    order = np.argsort(-scores)[:top]
+    return [(keys[i], float(scores[i])) for i in order]
+
+
+def break_caesar(ciphertext, model=None, top=5):
+    """Найімовірніші зсуви: список (shift, оцінка)."""
+    keys = [(1, shift) for shift in range(M)]
+    ranked = _ranked(keys, score_keys(ciphertext, keys, model), top)
+    return [(key[1], score) for key, score in ranked]
+
+
+def break_affine(ciphertext, model=None, top=5):
+    """Найімовірніші ключі: список ((a, b), оцінка)."""
+    keys = affine_keys()
+    return _ranked(keys, score_keys(ciphertext, keys, model), top)
+
+
+def crack(ciphertext, cipher="affine", model=None):
+    """Повертає (ключ, відкритий текст) для найкращого кандидата."""
+    if cipher == "caesar":
+        shift, _ = break_caesar(ciphertext, model, top=1)[0]
+        return shift, CaesarCipher(shift).decrypt(ciphertext)
+    (a, b), _ = break_affine(ciphertext, model, top=1)[0]
+    return (a, b), AffineCipher(a, b).decrypt(ciphertext)
+
+
+DEFAULT_MODEL = LanguageModel.from_frequencies()
+
+
+def bench(size_mb=1):
+    from bench import make_text
+    from main import make_keys
+
+    text = make_text(size_mb).lower()
+    shift, a, b = make_keys("10.05.2005", "Халіна")
+    caesar, affine = CaesarCipher(shift), AffineCipher(a, b)
+    c_text, a_text = caesar.encrypt(text), affine.encrypt(text)
+    print(f"Шифротекст: {len(text) / 1024 / 1024:.1f} М символів")
+    for name, model in (("частоти літер", DEFAULT_MODEL), ("біграми", LanguageModel.train(text[:200000]))):
+        t0 = time.perf_counter()
+        found_shift, _ = break_caesar(c_text, model, top=1)[0]
+        t1 = time.perf_counter()
+        found_key, _ = break_affine(a_text, model, top=1)[0]
+        t2 = time.perf_counter()
+        print(f"[{name}] Цезар: зсув {found_shift} ({'OK' if found_shift == caesar.shift else 'НЕВІРНО'})"
+              f" за {t1 - t0:.3f} с; афінний: {found_key}"
+              f" ({'OK' if found_key == (affine.a % M, affine.b) else 'НЕВІРНО'}) за {t2 - t1:.3f} с")
+
+
+if __name__ == "__main__":
+    bench(float(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -1,79 +1,173 @@
+import argparse
+import codecs
 import math
+import sys
+import time
 from collections import Counter
+from functools import lru_cache
+
+CIPHER_CACHE_SIZE = 256  # скільки об'єктів шифрів тримати в LRU-кеші
+DEFAULT_ALPHABET = "ukrainian"
+
+
+class Alphabet:
+    """
+    Алфавіт, скомпільований один раз: індекси літер і таблиці перекладу.
+    Таблиці для конкретної перестановки (ключа) кешуються в самому алфавіті,
+    тому шифри з однаковим ключем не будують їх повторно.
+    """
+    def __init__(self, name, letters):
+        if len(set(letters)) != len(letters):
+            raise ValueError(f"Алфавіт '{name}' містить повторювані літери")
+        self.name = name
+        self.letters = letters
+        self.size = len(letters)
+        self.index = {ch: i for i, ch in enumerate(letters)}
+        # Великі літери, що однозначно відповідають малим (для режиму збереження регістру)
+        self._upper = {i: ch.upper() for i, ch in enumerate(letters)
+                       if len(ch.upper()) == 1 and ch.upper() != ch}
+        self._tables = {}
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, ch):
+        return ch in self.index
+
+    def tables(self, mapping, preserve_case=False):
+        """
+        mapping — кортеж: індекс літери -> індекс зашифрованої літери.
+        Повертає пару таблиць str.translate (шифрування, розшифрування).
+        """
+        key = (mapping, preserve_case)
+        cached = self._tables.get(key)
+        if cached is None:
+            src = self.letters
+            dst = ''.join(self.letters[j] for j in mapping)
+            if preserve_case:
+                upper = [(self._upper[i], self._upper[j]) for i, j in enumerate(mapping)
+                         if i in self._upper and j in self._upper]
+                src += ''.join(u for u, _ in upper)
+                dst += ''.join(v for _, v in upper)
+            cached = (str.maketrans(src, dst), str.maketrans(dst, src))
+            self._tables[key] = cached
+        return cached
+
+
+ALPHABETS = {}
+
+
+def register_alphabet(name, letters):
+    """Додає алфавіт до реєстру (компілюється один раз) і повертає його."""
+    ALPHABETS[name] = Alphabet(name, letters)
+    return ALPHABETS[name]
+
+
+def get_alphabet(alphabet=DEFAULT_ALPHABET):
+    if isinstance(alphabet, Alphabet):
+        return alphabet
+    try:
+        return ALPHABETS[alphabet]
+    except KeyError:
+        raise ValueError(f"Невідомий алфавіт: {alphabet}") from None
+
+
+register_alphabet("ukrainian", 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя')
+register_alphabet("latin", 'abcdefghijklmnopqrstuvwxyz')
+register_alphabet("mixed", 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя' + 'abcdefghijklmnopqrstuvwxyz')
+
 
 class CaesarCipher:
-    def __init__(self, shift):
-        # Алфавіт української мови
-        self.alphabet = 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя'
+    def __init__(self, shift, alphabet=DEFAULT_ALPHABET, preserve_case=False):
+        # Алфавіт береться з реєстру (за замовчуванням — українська мова)
+        self.codec = get_alphabet(alphabet)
+        self.alphabet = self.codec.letters
+        self.preserve_case = preserve_case
         self.shift = shift % len(self.alphabet)
+        # Таблиці перекладу будуються один раз: далі текст перетворюється в C (str.translate)
+        mapping = tuple((idx + self.shift) % self.codec.size for idx in range(self.codec.size))
+        self._enc_table, self._dec_table = self.codec.tables(mapping, preserve_case)
 
     def encrypt(self, msg):
-        out_text = []
-        for ch in msg.lower():
-            if ch in self.alphabet:
-                idx = self.alphabet.index(ch)
-                new_idx = (idx + self.shift) % len(self.alphabet)
-                out_text.append(self.alphabet[new_idx])
-            else:
-                out_text.append(ch)
-        return ''.join(out_text)
+        # Символи поза алфавітом залишаються без змін
+        return (msg if self.preserve_case else msg.lower()).translate(self._enc_table)
 
     def decrypt(self, msg):
-        out_text = []
-        for ch in msg.lower():
-            if ch in self.alphabet:
-                idx = self.alphabet.index(ch)
-                new_idx = (idx - self.shift) % len(self.alphabet)
-                out_text.append(self.alphabet[new_idx])
-            else:
-                out_text.append(ch)
-        return ''.join(out_text)
+        return (msg if self.preserve_case else msg.lower()).translate(self._dec_table)
 
 
 class AffineCipher:
-    def __init__(self, a, b):
-        self.alphabet = 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя'
+    def __init__(self, a, b, alphabet=DEFAULT_ALPHABET, preserve_case=False):
+        self.codec = get_alphabet(alphabet)
+        self.alphabet = self.codec.letters
+        self.preserve_case = preserve_case
         self.m = len(self.alphabet)
         # Якщо a не взаємно просте з m, беремо інше
         if math.gcd(a, self.m) != 1:
             a = self._fix_a(a)
         self.a = a
         self.b = b % self.m
+        mapping = tuple((self.a * idx + self.b) % self.m for idx in range(self.m))
+        self._enc_table, self._dec_table = self.codec.tables(mapping, preserve_case)
 
     def _fix_a(self, a):
-        for i in range(a, a + 20):
-            if math.gcd(i, self.m) == 1:
-                return i
-        return 5
-
-    def _inverse(self, a, m):
-        for i in range(1, m):
-            if (a * i) % m == 1:
-                return i
-        return 1
+        return fix_multiplier(a, self.m)
 
     def encrypt(self, msg):
-        out_text = []
-        for ch in msg.lower():
-            if ch in self.alphabet:
-                idx = self.alphabet.index(ch)
-                new_idx = (self.a * idx + self.b) % self.m
-                out_text.append(self.alphabet[new_idx])
-            else:
-                out_text.append(ch)
-        return ''.join(out_text)
+        return (msg if self.preserve_case else msg.lower()).translate(self._enc_table)
 
     def decrypt(self, msg):
-        out_text = []
-        a_inv = self._inverse(self.a, self.m)
-        for ch in msg.lower():
-            if ch in self.alphabet:
-                idx = self.alphabet.index(ch)
-                new_idx = (a_inv * (idx - self.b)) % self.m
-                out_text.append(self.alphabet[new_idx])
-            else:
-                out_text.append(ch)
-        return ''.join(out_text)
+        # Таблиця розшифрування — обернена до таблиці шифрування, a^-1 тут не потрібен
+        return (msg if self.preserve_case else msg.lower()).translate(self._dec_table)
+
+
+@lru_cache(maxsize=1024)
+def fix_multiplier(a, m):
+    """Найближче a' >= a, взаємно просте з m (не далі ніж через 20), інакше 5."""
+    for i in range(a, a + 20):
+        if math.gcd(i, m) == 1:
+            return i
+    return 5
+
+
+@lru_cache(maxsize=1024)
+def mod_inverse(a, m):
+    """Обернений елемент a за модулем m (розширений алгоритм Евкліда), 1 якщо не існує."""
+    old_r, r = a % m, m
+    old_s, s = 1, 0
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_s, s = s, old_s - q * s
+    return old_s % m if old_r == 1 else 1
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def get_caesar(shift, alphabet=DEFAULT_ALPHABET, preserve_case=False):
+    return CaesarCipher(shift, alphabet, preserve_case)
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def get_affine(a, b, alphabet=DEFAULT_ALPHABET, preserve_case=False):
+    return AffineCipher(a, b, alphabet, preserve_case)
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def get_ciphers(date, surname, alphabet=DEFAULT_ALPHABET, preserve_case=False):
+    """Пара (Цезар, афінний) для персональних даних; шифри не змінюються після створення."""
+    c_shift, a_a, a_b = make_keys(date, surname)
+    return get_caesar(c_shift, alphabet, preserve_case), get_affine(a_a, a_b, alphabet, preserve_case)
+
+
+def cache_stats():
+    """Лічильники кешів ключів для моніторингу: hits, misses, maxsize, currsize."""
+    return {fn.__name__: fn.cache_info()._asdict()
+            for fn in (fix_multiplier, mod_inverse, get_caesar, get_affine, get_ciphers)}
+
+
+def clear_caches():
+    for fn in (fix_multiplier, mod_inverse, get_caesar, get_affine, get_ciphers):
+        fn.cache_clear()
 
 
 def make_keys(date, surname):
@@ -85,8 +179,37 @@ def make_keys(date, surname):
     return shift, a, b
 
 
-def quick_analysis(original, encrypted):
-    alphabet = 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя'
+CHUNK_SIZE = 1 << 20  # 1 МБ сирих байтів за раз
+
+
+def transform_stream(src, dst, transform, chunk_size=CHUNK_SIZE):
+    """
+    Потокове шифрування: src/dst — бінарні файли, transform — cipher.encrypt або cipher.decrypt.
+    Інкрементальний декодер UTF-8 утримує неповні багатобайтові символи на межі блоків,
+    тому в пам'яті одночасно лише один блок. Повертає кількість прочитаних байтів.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    total = 0
+    while True:
+        data = src.read(chunk_size)
+        total += len(data)
+        text = decoder.decode(data, final=not data)
+        if text:
+            dst.write(transform(text).encode("utf-8"))
+        if not data:
+            return total
+
+
+def transform_file(src_path, dst_path, transform, chunk_size=CHUNK_SIZE):
+    """Шифрує/розшифровує файл блоками, повертає (байтів, секунд)."""
+    t0 = time.perf_counter()
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        total = transform_stream(src, dst, transform, chunk_size)
+    return total, time.perf_counter() - t0
+
+
+def quick_analysis(original, encrypted, alphabet=DEFAULT_ALPHABET):
+    alphabet = get_alphabet(alphabet)
     changed = sum(1 for i in range(len(original)) if original[i] != encrypted[i])
     freq = Counter(ch for ch in encrypted.lower() if ch in alphabet)
     return {
@@ -150,8 +273,7 @@ def main():
     print("Згенеровані ключі:")
     print("Цезар:", c_shift)
     print("Афінний: a=", a_a, ", b=", a_b)
-    caesar = CaesarCipher(c_shift)
-    affine = AffineCipher(a_a, a_b)
+    caesar, affine = get_ciphers(date, surname)
     while True:
         print("\nМеню:")
         print("1. Шифрувати")
@@ -169,9 +291,7 @@ def main():
         elif choice == '4':
             date = input("Нова дата: ")
             surname = input("Нове прізвище: ")
-            c_shift, a_a, a_b = make_keys(date, surname)
-            caesar = CaesarCipher(c_shift)
-            affine = AffineCipher(a_a, a_b)
+            caesar, affine = get_ciphers(date, surname)
             print("Ключі оновлено")
         elif choice == '0':
             print("Вихід")
@@ -180,5 +300,32 @@ def main():
             print("Невірний вибір")
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Потокове шифрування файлів шифром Цезаря або афінним шифром.")
+    parser.add_argument("action", choices=("encrypt", "decrypt"))
+    parser.add_argument("-c", "--cipher", choices=("caesar", "affine"), default="caesar")
+    parser.add_argument("--date", required=True, help="дата народження для генерації ключів")
+    parser.add_argument("--surname", required=True, help="прізвище для генерації ключів")
+    parser.add_argument("-i", "--input", required=True, help="вхідний файл UTF-8")
+    parser.add_argument("-o", "--output", required=True, help="вихідний файл")
+    parser.add_argument("-a", "--alphabet", choices=sorted(ALPHABETS), default=DEFAULT_ALPHABET)
+    parser.add_argument("--preserve-case", action="store_true", help="зберігати регістр літер")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="розмір блоку в байтах")
+    return parser.parse_args(argv)
+
+
+def file_main(argv):
+    args = parse_args(argv)
+    caesar, affine = get_ciphers(args.date, args.surname, args.alphabet, args.preserve_case)
+    cipher = caesar if args.cipher == "caesar" else affine
+    transform = cipher.encrypt if args.action == "encrypt" else cipher.decrypt
+    total, elapsed = transform_file(args.input, args.output, transform, args.chunk_size)
+    mb = total / 1024 / 1024
+    print(f"Оброблено {mb:.2f} МБ за {elapsed:.3f} с ({mb / elapsed if elapsed else 0:.1f} МБ/с) -> {args.output}")
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        file_main(sys.argv[1:])
+    else:
+        main()
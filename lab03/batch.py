@@ -0,0 +1,107 @@
+"""
+Пакетна стеганографія: приховування/витягування повідомлень для багатьох
+зображень за маніфестом у пулі процесів.
+
+Маніфест — CSV з заголовком (image,output,message) або JSONL з тими ж ключами.
+Для витягування достатньо стовпця image. Одночасно в роботі не більше
+2 * workers завдань, тому маніфест читається потоково і пам'ять обмежена.
+Помилка окремого зображення (зокрема нестача ємності з hide_message)
+потрапляє у звіт і не зупиняє решту.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from main import extract_message, hide_message
+
+
+def read_manifest(path):
+    """Потоково читає маніфест: словники з ключами image, output, message."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def embed_item(item, options):
+    image = item.get("image", "")
+    try:
+        hide_message(image, item["output"], item.get("message", ""), verbose=False, **options)
+        return {"image": image, "output": item["output"], "ok": True,
+                "bytes": os.path.getsize(image)}
+    except Exception as e:
+        return {"image": image, "output": item.get("output"), "ok": False, "error": str(e)}
+
+
+def extract_item(item, options):
+    image = item.get("image", "")
+    try:
+        message = extract_message(image, **options)
+        return {"image": image, "ok": True, "message": message, "bytes": os.path.getsize(image)}
+    except Exception as e:
+        return {"image": image, "ok": False, "error": str(e)}
+
+
+def run_batch(items, action="embed", workers=None, **options):
+    """
+    Генератор результатів у порядку маніфесту.
+    options — параметри hide_message/extract_message (length_header, bits_per_channel, channels, key).
+    """
+    worker = embed_item if action == "embed" else extract_item
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for item in items:
+            pending.append(pool.submit(worker, item, options))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Пакетне LSB-приховування/витягування за маніфестом.")
+    parser.add_argument("action", choices=("embed", "extract"))
+    parser.add_argument("manifest", help="CSV (image,output,message) або JSONL")
+    parser.add_argument("-o", "--output", default="-", help="файл звіту JSONL, '-' — stdout")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="кількість процесів (0 — усі ядра)")
+    parser.add_argument("--length-header", action="store_true", help="формат з 4-байтовою довжиною")
+    parser.add_argument("--bits", type=int, default=1, help="біт на канал (1–4)")
+    parser.add_argument("--channels", default="RGB", help="маска каналів, напр. RGB, B, RGBA")
+    parser.add_argument("--key", help="ключ для псевдовипадкового розсіювання пікселів")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    done = failed = total_bytes = 0
+    t0 = time.perf_counter()
+    try:
+        for res in run_batch(read_manifest(args.manifest), args.action, args.workers or None,
+                             length_header=args.length_header, bits_per_channel=args.bits,
+                             channels=args.channels, key=args.key):
+            out.write(json.dumps(res, ensure_ascii=False) + "\n")
+            if res["ok"]:
+                done += 1
+                total_bytes += res["bytes"]
+            else:
+                failed += 1
+                print(f"✗ {res['image']}: {res['error']}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - t0
+    print(f"Успішно: {done}, з помилками: {failed}, час: {elapsed:.2f} с", file=sys.stderr)
+    if elapsed > 0:
+        print(f"Швидкість: {(done + failed) / elapsed:.1f} зображень/с, "
+              f"{total_bytes / 1024 / 1024 / elapsed:.1f} МБ/с", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
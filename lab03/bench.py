@@ -0,0 +1,122 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from main import bits_to_text, extract_message, generate_cover, hide_message, text_to_bits
+
+DELIMITER = "###END###"
+MESSAGE = "Халіна Ольга Дмитріївна, 6.04.122.010.22.1, ДН: 10.05.2005 " * 20
+
+
+def legacy_hide(input_image_path, output_image_path, message):
+    # Попередня реалізація: цикл по пікселях через pixels[x, y]
+    message_bits = text_to_bits(message + DELIMITER)
+    img = Image.open(input_image_path).convert('RGB')
+    pixels = img.load()
+    width, height = img.size
+    bit_index = 0
+    for y in range(height):
+        for x in range(width):
+            if bit_index >= len(message_bits):
+                break
+            channels = list(pixels[x, y])
+            for c in range(3):
+                if bit_index < len(message_bits):
+                    channels[c] = (channels[c] & ~1) | message_bits[bit_index]
+                    bit_index += 1
+            pixels[x, y] = tuple(channels)
+        if bit_index >= len(message_bits):
+            break
+    img.save(output_image_path, 'PNG')
+
+
+def legacy_extract(image_path):
+    img = Image.open(image_path).convert('RGB')
+    pixels = img.load()
+    width, height = img.size
+    bits = []
+    for y in range(height):
+        for x in range(width):
+            r, g, b = pixels[x, y]
+            bits.append(r & 1)
+            bits.append(g & 1)
+            bits.append(b & 1)
+    text = bits_to_text(bits)
+    end_pos = text.find(DELIMITER)
+    return text[:end_pos] if end_pos != -1 else text
+
+
+def make_cover(path, width, height, seed=0, kind="random"):
+    generate_cover(width, height, kind=kind, seed=seed).save(path, 'PNG')
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def bench(sizes=((400, 300), (1000, 1000), (2000, 2000), (6000, 4000)), legacy_limit=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        cover = os.path.join(tmp, "cover.png")
+        new_out = os.path.join(tmp, "new.png")
+        old_out = os.path.join(tmp, "old.png")
+        for width, height in sizes:
+            make_cover(cover, width, height)
+            _, t_hide = timed(hide_message, cover, new_out, MESSAGE)
+            extracted, t_extract = timed(extract_message, new_out)
+            assert extracted == MESSAGE
+            line = f"{width}x{height} ({width * height / 1e6:.1f} Мп): hide {t_hide:.3f} с, extract {t_extract:.3f} с"
+            if width * height <= legacy_limit:
+                _, t_old_hide = timed(legacy_hide, cover, old_out, MESSAGE)
+                old_extracted, t_old_extract = timed(legacy_extract, old_out)
+                same = np.array_equal(np.array(Image.open(new_out)), np.array(Image.open(old_out)))
+                if not same or old_extracted != extracted:
+                    print("ПОМИЛКА: результат відрізняється від попередньої реалізації")
+                    sys.exit(1)
+                line += f" | попередня: hide {t_old_hide:.3f} с, extract {t_old_extract:.3f} с"
+            print(line)
+
+
+def bench_modes(width=2000, height=1500):
+    """Ємність і швидкість на байт payload для різних bits_per_channel / масок каналів."""
+    modes = [(1, "RGB"), (2, "RGB"), (3, "RGB"), (4, "RGB"), (1, "B"), (2, "RGBA"), (4, "RGBA")]
+    with tempfile.TemporaryDirectory() as tmp:
+        cover = os.path.join(tmp, "cover.png")
+        out = os.path.join(tmp, "stego.png")
+        rng = np.random.default_rng(0)
+        Image.fromarray(rng.integers(0, 256, (height, width, 4), dtype=np.uint8), 'RGBA').save(cover, 'PNG')
+        for k, channels in modes:
+            capacity = width * height * len(channels) * k // 8
+            message = "x" * (capacity // 2)  # половина ємності
+            _, t_hide = timed(hide_message, cover, out, message, False, True, k, channels)
+            extracted, t_extract = timed(extract_message, out, False, k, channels)
+            assert extracted == message
+            mb = len(message) / 1024 / 1024
+            print(f"{k} біт x {channels:<4} ємність {capacity / 1024 / 1024:5.2f} МБ: "
+                  f"hide {mb / t_hide:6.2f} МБ/с, extract {mb / t_extract:6.2f} МБ/с payload")
+
+
+def bench_covers(sizes=((400, 300), (2000, 2000), (6000, 4000))):
+    """Час генерації контейнерів (без збереження у файл)."""
+    for width, height in sizes:
+        for kind in ("noise", "gradient", "random"):
+            t0 = time.perf_counter()
+            generate_cover(width, height, kind=kind, seed=1)
+            print(f"{width}x{height} {kind:<9} {(time.perf_counter() - t0) * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--modes":
+        bench_modes()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--covers":
+        bench_covers()
+    else:
+        bench()
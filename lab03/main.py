@@ -1,6 +1,10 @@
 from PIL import Image
+import numpy as np
+import hashlib
 import os
 
+from steganalysis import compare_images, print_comparison
+
 # ЕТАП 1: ПОКРОКОВИЙ АЛГОРИТМ
 """
 АЛГОРИТМ ПРИХОВУВАННЯ:
@@ -41,105 +45,260 @@ def bits_to_text(bits):
             ba.append(byte)
     return ba.decode("utf-8", errors="ignore")
 
-def hide_message(input_image_path, output_image_path, message):
+DELIMITER = "###END###"
+HEADER_BYTES = 4  # довжина повідомлення у форматі з заголовком (як у lab07), big-endian
+
+
+def build_payload(message, length_header=False):
+    """Байти для вбудовування: повідомлення + delimiter або 4-байтова довжина + повідомлення."""
+    data = message.encode("utf-8")
+    if length_header:
+        return len(data).to_bytes(HEADER_BYTES, "big") + data
+    return data + DELIMITER.encode("utf-8")
+
+
+def lsb_layout(bits_per_channel=1, channels="RGB"):
+    """
+    Перевіряє параметри ємності і повертає (режим зображення, індекси каналів).
+    Канали завжди обходяться в порядку зображення (R→G→B→A), незалежно від порядку в рядку.
+    """
+    channels = channels.upper()
+    if not channels or any(c not in "RGBA" for c in channels) or len(set(channels)) != len(channels):
+        raise ValueError(f"Невірна маска каналів: {channels!r} (допустимо R, G, B, A)")
+    if not 1 <= bits_per_channel <= 4:
+        raise ValueError(f"Кількість біт на канал має бути від 1 до 4, отримано {bits_per_channel}")
+    mode = 'RGBA' if 'A' in channels else 'RGB'
+    return mode, [i for i, c in enumerate(mode) if c in channels]
+
+
+class FeistelPermutation:
+    """
+    Ключова псевдовипадкова перестановка індексів пікселів [0, n) без таблиці в пам'яті.
+    Мережа Фейстеля на 2 * half біт + cycle walking: значення поза [0, n)
+    шифруються повторно, доки не потраплять у діапазон. Тому позиція i-го
+    пікселя обчислюється незалежно, і вбудовування/витягування торкаються лише
+    тих пікселів, які потрібні для payload.
+    """
+    MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+    def __init__(self, n, key, rounds=4):
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = np.uint64((1 << self.half) - 1)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * rounds, person=b"lab03-scatter").digest()
+        self.round_keys = np.frombuffer(digest, dtype="<u8")
+
+    def _round(self, right, round_key):
+        # Старші біти добутку — добре перемішана функція від правої половини і ключа раунду
+        return ((right ^ round_key) * self.MULTIPLIER) >> np.uint64(64 - self.half)
+
+    def _encrypt(self, x):
+        shift = np.uint64(self.half)
+        left, right = x >> shift, x & self.mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << shift) | right
+
+    def __call__(self, indices):
+        out = self._encrypt(np.asarray(indices, dtype=np.uint64))
+        outside = out >= self.n
+        while outside.any():
+            out[outside] = self._encrypt(out[outside])
+            outside = out >= self.n
+        return out.astype(np.int64)
+
+
+def hide_message(input_image_path, output_image_path, message, length_header=False, verbose=True,
+                 bits_per_channel=1, channels="RGB", key=None):
     """
     Ховає повідомлення в зображення методом LSB
         input_image_path: шлях до вхідного зображення
         output_image_path: шлях для збереження зображення з повідомленням
         message: текст для приховування
+        length_header: замість delimiter записати на початку довжину повідомлення
+        verbose: друкувати інформацію про ємність і результат
+        bits_per_channel: скільки молодших біт кожного каналу використовувати (1–4)
+        channels: маска каналів, напр. "RGB", "B" або "RGBA" (з альфа-каналом)
+        key: якщо задано, пікселі обираються в псевдовипадковому порядку за ключем
     """
-    # Додаємо delimiter для визначення кінця повідомлення
-    delimiter = "###END###"
-    full_message = message + delimiter
+    mode, channel_idx = lsb_layout(bits_per_channel, channels)
+    k = bits_per_channel
     
-    # Конвертуємо повідомлення в біти
-    message_bits = text_to_bits(full_message)
+    # Додаємо delimiter (або заголовок з довжиною) для визначення кінця повідомлення
+    full_message = message if length_header else message + DELIMITER
+    payload = build_payload(message, length_header)
     
-    # Відкриваємо зображення
+    # Конвертуємо повідомлення в біти (старший біт першим, як у text_to_bits)
+    message_bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    
+    # Відкриваємо зображення як масив (висота, ширина, канали): порядок R→G→B(→A), рядок за рядком
     img = Image.open(input_image_path)
-    img = img.convert('RGB')  # Конвертуємо в RGB якщо потрібно
-    pixels = img.load()
+    img = img.convert(mode)  # Конвертуємо в RGB (або RGBA) якщо потрібно
+    pixels = np.array(img, dtype=np.uint8)
     
-    width, height = img.size
-    max_bits = width * height * 3  # 3 канали RGB
+    height, width = pixels.shape[:2]
+    max_bits = width * height * len(channel_idx) * k
     
     # Перевіряємо чи достатньо місця
     if len(message_bits) > max_bits:
         raise ValueError(f"Повідомлення завелике! Максимум {max_bits} біт, потрібно {len(message_bits)}")
     
-    print(f"Зображення: {width}x{height} пікселів")
-    print(f"Доступно біт: {max_bits}")
-    print(f"Повідомлення: {len(message_bits)} біт ({len(full_message)} символів)")
+    if verbose:
+        print(f"Зображення: {width}x{height} пікселів")
+        print(f"Доступно біт: {max_bits}")
+        print(f"Повідомлення: {len(message_bits)} біт ({len(full_message)} символів)")
     
-    # Ховаємо повідомлення
-    bit_index = 0
-    for y in range(height):
-        for x in range(width):
-            if bit_index >= len(message_bits):
-                break
-                
-            r, g, b = pixels[x, y]
-            
-            # Замінюємо LSB червоного каналу
-            if bit_index < len(message_bits):
-                r = (r & ~1) | message_bits[bit_index]
-                bit_index += 1
-            
-            # Можна використовувати і зелений канал для більшої ємності
-            if bit_index < len(message_bits):
-                g = (g & ~1) | message_bits[bit_index]
-                bit_index += 1
-            
-            # І синій канал
-            if bit_index < len(message_bits):
-                b = (b & ~1) | message_bits[bit_index]
-                bit_index += 1
-            
-            pixels[x, y] = (r, g, b)
-        
-        if bit_index >= len(message_bits):
-            break
+    # Групуємо біти по k (доповнюємо нулями) — одне значення на канал
+    slots = -(-len(message_bits) // k)
+    message_bits = np.concatenate((message_bits, np.zeros(slots * k - len(message_bits), dtype=np.uint8)))
+    values = np.packbits(message_bits.reshape(-1, k), axis=1)[:, 0] >> (8 - k)
+    
+    # Ховаємо повідомлення: змінюємо лише ті пікселі, що потрібні для payload
+    flat = pixels.reshape(-1, pixels.shape[2])
+    used_pixels = -(-slots // len(channel_idx))
+    if key is None:
+        positions = np.arange(used_pixels)
+    else:
+        positions = FeistelPermutation(width * height, key)(np.arange(used_pixels))
+    selection = np.ix_(positions, channel_idx)
+    region = flat[selection].reshape(-1)
+    region[:slots] = (region[:slots] & (0xFF ^ ((1 << k) - 1))) | values
+    flat[selection] = region.reshape(used_pixels, len(channel_idx))
     
     # Зберігаємо в PNG
-    img.save(output_image_path, 'PNG')
-    print(f"✓ Повідомлення заховано в {output_image_path}")
+    Image.fromarray(pixels, mode).save(output_image_path, 'PNG')
+    if verbose:
+        print(f"✓ Повідомлення заховано в {output_image_path}")
+
 
+def _low_bits(values, k):
+    """Молодші k біт кожного значення, старший з них першим."""
+    if k == 1:
+        return values & 1
+    return np.unpackbits(values[:, None], axis=1)[:, 8 - k:].reshape(-1)
 
-def extract_message(image_path):
+
+def iter_lsb_bytes(img, max_block_rows=256, bits_per_channel=1, channels="RGB"):
+    """
+    Генератор байтів, зібраних з молодших біт вибраних каналів (рядок за рядком).
+    Зображення читається смугами рядків, що поступово збільшуються,
+    тому для короткого повідомлення обробляються лише перші рядки.
+    """
+    mode, channel_idx = lsb_layout(bits_per_channel, channels)
+    k = bits_per_channel
+    width, height = img.size
+    carry = np.empty(0, dtype=np.uint8)
+    rows = 1
+    y = 0
+    while y < height:
+        band = img.crop((0, y, width, min(height, y + rows)))
+        if band.mode != mode:
+            band = band.convert(mode)
+        values = np.asarray(band, dtype=np.uint8)[..., channel_idx].reshape(-1)
+        bits = np.concatenate((carry, _low_bits(values, k)))
+        usable = len(bits) - len(bits) % 8
+        carry = bits[usable:]
+        yield np.packbits(bits[:usable]).tobytes()
+        y += rows
+        rows = min(rows * 2, max_block_rows)
+
+
+def iter_scattered_bytes(img, key, bits_per_channel=1, channels="RGB", max_block_pixels=65536):
+    """
+    Те саме, що iter_lsb_bytes, але пікселі читаються в порядку FeistelPermutation за ключем.
+    Позиції обчислюються блоками, що поступово збільшуються, тож для короткого
+    повідомлення обробляється лише кілька пікселів.
+    """
+    mode, channel_idx = lsb_layout(bits_per_channel, channels)
+    if img.mode != mode:
+        img = img.convert(mode)
+    flat = np.asarray(img, dtype=np.uint8).reshape(-1, len(mode))
+    permutation = FeistelPermutation(len(flat), key)
+    carry = np.empty(0, dtype=np.uint8)
+    start, size = 0, 8
+    while start < len(flat):
+        end = min(len(flat), start + size)
+        values = flat[np.ix_(permutation(np.arange(start, end)), channel_idx)].reshape(-1)
+        bits = np.concatenate((carry, _low_bits(values, bits_per_channel)))
+        usable = len(bits) - len(bits) % 8
+        carry = bits[usable:]
+        yield np.packbits(bits[:usable]).tobytes()
+        start, size = end, min(size * 2, max_block_pixels)
+
+
+def extract_message(image_path, length_header=False, bits_per_channel=1, channels="RGB", key=None):
     """
     Витягує приховане повідомлення з зображення
     image_path: шлях до зображення з прихованим повідомленням
+    length_header: повідомлення записане з 4-байтовою довжиною замість delimiter
+    bits_per_channel, channels, key: ті самі параметри, що й при приховуванні
     str: витягнуте повідомлення
+    
+    Байти декодуються по мірі читання, і зчитування зупиняється на delimiter
+    (або після заявленої довжини), тож обробляється лише потрібна частина пікселів.
     """
-    delimiter = "###END###"
+    delimiter = DELIMITER.encode("utf-8")
     
     # Відкриваємо зображення
     img = Image.open(image_path)
-    img = img.convert('RGB')
-    pixels = img.load()
+    if key is None:
+        blocks = iter_lsb_bytes(img, bits_per_channel=bits_per_channel, channels=channels)
+    else:
+        blocks = iter_scattered_bytes(img, key, bits_per_channel=bits_per_channel, channels=channels)
     
-    width, height = img.size
+    data = bytearray()
+    if length_header:
+        length = None
+        for block in blocks:
+            data += block
+            if length is None and len(data) >= HEADER_BYTES:
+                length = int.from_bytes(data[:HEADER_BYTES], "big")
+            if length is not None and len(data) >= HEADER_BYTES + length:
+                break
+        end = HEADER_BYTES + (length or 0)
+        return bytes(data[HEADER_BYTES:end]).decode("utf-8", errors="ignore")
     
-    # Витягуємо біти
-    bits = []
-    for y in range(height):
-        for x in range(width):
-            r, g, b = pixels[x, y]
-            
-            # Читаємо LSB з кожного каналу
-            bits.append(r & 1)
-            bits.append(g & 1)
-            bits.append(b & 1)
-    
-    # Конвертуємо біти в текст
-    text = bits_to_text(bits)
-    
-    # Шукаємо delimiter
-    end_pos = text.find(delimiter)
-    if end_pos != -1:
-        return text[:end_pos]
+    # Шукаємо delimiter лише в нових байтах (з запасом на delimiter на межі блоків)
+    for block in blocks:
+        start = max(0, len(data) - len(delimiter) + 1)
+        data += block
+        end_pos = data.find(delimiter, start)
+        if end_pos != -1:
+            return bytes(data[:end_pos]).decode("utf-8", errors="ignore")
+    
+    # Якщо delimiter не знайдено, повертаємо весь текст
+    text = bytes(data).decode("utf-8", errors="ignore")
+    end_pos = text.find(DELIMITER)
+    return text[:end_pos] if end_pos != -1 else text
+
+
+def generate_cover(width=400, height=300, kind="noise", seed=None, color=(73, 109, 137), amplitude=20):
+    """
+    Синтетичне зображення-контейнер, створене масивами NumPy (мілісекунди навіть для великих розмірів).
+        kind: "noise" — колір color з рівномірним шумом ±amplitude;
+              "gradient" — плавні градієнти по каналах з тим самим шумом;
+              "random" — повністю випадкові пікселі
+        seed: зерно генератора для відтворюваних зображень
+    """
+    rng = np.random.default_rng(seed)
+    if kind == "random":
+        return Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), 'RGB')
+    pixels = np.empty((height, width, 3), dtype=np.int16)
+    if kind == "noise":
+        pixels[:] = color
+    elif kind == "gradient":
+        x = np.linspace(0, 255, width).astype(np.int16)
+        y = np.linspace(0, 255, height).astype(np.int16)[:, None]
+        pixels[..., 0] = x
+        pixels[..., 1] = y
+        pixels[..., 2] = (x + y) // 2
     else:
-        return text  # Якщо delimiter не знайдено, повертаємо весь текст
+        raise ValueError(f"Невідомий тип зображення: {kind}")
+    # Шум генерується байтами (0..2*amplitude) і зсувається — так швидше, ніж int16 зі знаком
+    pixels += rng.integers(0, 2 * amplitude + 1, (height, width, 3), dtype=np.uint8)
+    pixels -= amplitude
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
 
 
 # ЕТАП 3: ДЕМОНСТРАЦІЯ НА ВЛАСНИХ ДАНИХ
@@ -148,18 +307,7 @@ def demo():
     # Створюємо тестове зображення якщо немає
     if not os.path.exists('original.png'):
         print("Створюю тестове зображення...")
-        img = Image.new('RGB', (400, 300), color=(73, 109, 137))
-        
-        # Додаємо трохи шуму для реалістичності
-        pixels = img.load()
-        for y in range(300):
-            for x in range(400):
-                r, g, b = pixels[x, y]
-                import random
-                r = min(255, max(0, r + random.randint(-20, 20)))
-                g = min(255, max(0, g + random.randint(-20, 20)))
-                b = min(255, max(0, b + random.randint(-20, 20)))
-                pixels[x, y] = (r, g, b)
+        img = generate_cover(400, 300, kind="noise")
         
         img.save('original.png', 'PNG')
         print("✓ Створено original.png")
@@ -195,32 +343,9 @@ def demo():
     print(f"Розмір стего: {stego_size} байт")
     print(f"Різниця: {stego_size - original_size} байт")
     
-    # Порівняння пікселів
-    img1 = Image.open('original.png')
-    img2 = Image.open('stego.png')
-    
-    pixels1 = img1.load()
-    pixels2 = img2.load()
-    
-    width, height = img1.size
-    diff_count = 0
-    max_diff = 0
-    
-    for y in range(height):
-        for x in range(width):
-            r1, g1, b1 = pixels1[x, y]
-            r2, g2, b2 = pixels2[x, y]
-            
-            diff = abs(r1 - r2) + abs(g1 - g1) + abs(b1 - b2)
-            if diff > 0:
-                diff_count += 1
-                max_diff = max(max_diff, diff)
-    
-    total_pixels = width * height
+    # Порівняння пікселів (масивами, по всіх трьох каналах)
     print(f"\nВізуальні зміни:")
-    print(f"Змінено пікселів: {diff_count} з {total_pixels}")
-    print(f"Відсоток змін: {(diff_count/total_pixels)*100:.2f}%")
-    print(f"Максимальна різниця: {max_diff} (зміна на 1 біт)")
+    print_comparison(compare_images('original.png', 'stego.png'))
     print("\nЗміни НЕПОМІТНІ для людського ока!")
 
 
@@ -0,0 +1,134 @@
+"""
+Аналіз змін між зображеннями та LSB-стегоаналіз (масивами NumPy).
+
+* compare_images — кількість змінених пікселів, зміни по каналах, MSE та PSNR;
+* chi_square_lsb — атака хі-квадрат (Westfeld–Pfitzmann): при LSB-вбудовуванні
+  частоти пар значень (2k, 2k+1) вирівнюються, і ймовірність вбудовування
+  наближається до 1. Профіль по префіксах зображення показує, до якого місця
+  (у порядку рядків) дані записані послідовно;
+* scan_directory — хі-квадрат для всіх зображень каталогу.
+"""
+import math
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+CHANNELS = ("R", "G", "B")
+IMAGE_EXTENSIONS = (".png", ".bmp", ".tif", ".tiff")
+
+
+def load_rgb(image):
+    """Шлях або PIL.Image -> масив uint8 (висота, ширина, 3)."""
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+    return np.asarray(image.convert('RGB'), dtype=np.uint8)
+
+
+def compare_images(original, modified):
+    """Порівнює два зображення однакового розміру, повертає словник метрик."""
+    a = load_rgb(original).astype(np.int16)
+    b = load_rgb(modified).astype(np.int16)
+    if a.shape != b.shape:
+        raise ValueError(f"Розміри зображень відрізняються: {a.shape[:2]} і {b.shape[:2]}")
+
+    diff = np.abs(a - b)
+    pixel_diff = diff.sum(axis=2)
+    changed = int(np.count_nonzero(pixel_diff))
+    mse = float(np.mean((a - b).astype(np.float64) ** 2))
+    psnr = math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+    return {
+        "total_pixels": a.shape[0] * a.shape[1],
+        "changed_pixels": changed,
+        "max_diff": int(pixel_diff.max(initial=0)),
+        "channels": {
+            name: {"changed": int(np.count_nonzero(diff[..., i])), "max_diff": int(diff[..., i].max(initial=0))}
+            for i, name in enumerate(CHANNELS)
+        },
+        "mse": mse,
+        "psnr": psnr,
+    }
+
+
+def _chi2_sf(stat, df):
+    """Ймовірність P(X > stat) для хі-квадрат (наближення Вілсона–Гілферті)."""
+    if df <= 0:
+        return 1.0
+    z = ((stat / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _chi_square(hist):
+    even, odd = hist[..., 0::2], hist[..., 1::2]
+    expected = (even + odd) / 2
+    mask = expected > 0
+    terms = np.where(mask, (even - expected) ** 2 / np.where(mask, expected, 1), 0.0)
+    return terms.sum(axis=-1), mask.sum(axis=-1) - 1
+
+
+def chi_square_lsb(image, steps=10):
+    """
+    Атака хі-квадрат на значення всіх каналів у порядку вбудовування (R→G→B, рядок за рядком).
+    Повертає загальну ймовірність вбудовування та профіль для перших 1/steps, 2/steps, ... даних.
+    """
+    values = load_rgb(image).reshape(-1)
+    steps = max(1, min(steps, len(values)))
+    # Гістограма кожного блоку (array_split дає представлення без копій і без
+    # масивів індексів), потім кумулятивна сума — гістограми всіх префіксів одразу
+    hist = np.stack([np.bincount(part, minlength=256) for part in np.array_split(values, steps)])
+    prefix = np.cumsum(hist, axis=0).astype(np.float64)
+    stats, dfs = _chi_square(prefix)
+    # Велика подібність пар (мале хі-квадрат) => висока ймовірність вбудовування
+    profile = [_chi2_sf(float(s), int(d)) for s, d in zip(stats, dfs)]
+    return {
+        "chi2": float(stats[-1]),
+        "df": int(dfs[-1]),
+        "probability": profile[-1],
+        "profile": profile,
+    }
+
+
+def scan_directory(path, steps=10):
+    """Хі-квадрат для кожного зображення каталогу: {шлях: звіт або помилка}."""
+    reports = {}
+    for name in sorted(os.listdir(path)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        full = os.path.join(path, name)
+        try:
+            reports[full] = chi_square_lsb(full, steps)
+        except Exception as e:
+            reports[full] = {"error": str(e)}
+    return reports
+
+
+def print_comparison(report):
+    total = report["total_pixels"]
+    print(f"Змінено пікселів: {report['changed_pixels']} з {total}")
+    print(f"Відсоток змін: {(report['changed_pixels'] / total) * 100:.2f}%")
+    print(f"Максимальна зміна пікселя: {report['max_diff']} (сума змін по каналах R, G, B)")
+    for name, ch in report["channels"].items():
+        print(f"  Канал {name}: змінено {ch['changed']}, макс. різниця {ch['max_diff']}")
+    print(f"MSE: {report['mse']:.6f}, PSNR: {report['psnr']:.2f} дБ")
+
+
+def main(argv):
+    if len(argv) == 3 and argv[0] == "diff":
+        print_comparison(compare_images(argv[1], argv[2]))
+    elif len(argv) == 2 and argv[0] == "scan":
+        target = argv[1]
+        reports = scan_directory(target) if os.path.isdir(target) else {target: chi_square_lsb(target)}
+        for path, rep in reports.items():
+            if "error" in rep:
+                print(f"{path}: помилка {rep['error']}")
+            else:
+                profile = " ".join(f"{p:.2f}" for p in rep["profile"])
+                print(f"{path}: ймовірність LSB-вбудовування {rep['probability']:.3f} (профіль: {profile})")
+    else:
+        print("Використання: python steganalysis.py diff <оригінал> <стего> | scan <файл або каталог>")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+from main import BACKENDS, DigitalSignatureSystem
+
+
+def make_documents(count, size=512):
+    return [f"Документ №{i}: " + "Халіна Ольга Дмитріївна, 10.05.2005. " * (size // 38) for i in range(count)]
+
+
+def bench(count=2000, workers=None):
+    documents = make_documents(count)
+    workers = workers or os.cpu_count()
+    print(f"Документів: {count}, потоків для verify_many: {workers}")
+    for name in BACKENDS:
+        system = DigitalSignatureSystem(name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            system.generate_keys("Халіна", "10.05.2005", "секрет")
+            t0 = time.perf_counter()
+            signed = [(doc, system.sign_document(doc)[0]) for doc in documents]
+            t_sign = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        serial = system.verify_many(signed, workers=1)
+        t_serial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        parallel = system.verify_many(signed, workers=workers)
+        t_parallel = time.perf_counter() - t0
+        forged = system.verify_many([(doc + "!", sig) for doc, sig in signed[:100]], workers=workers)
+        if not all(serial) or serial != parallel or any(forged):
+            print(f"ПОМИЛКА: некоректний результат перевірки для {name}")
+            sys.exit(1)
+        print(f"{name:<8} підпис: {count / t_sign:9.0f}/с   перевірка: {count / t_serial:9.0f}/с"
+              f" (1 потік), {count / t_parallel:9.0f}/с ({workers} потоків)")
+
+
+def bench_cache(count=1000, rounds=5):
+    """Повторна перевірка тих самих документів: verify_many проти SignatureVerifier з кешем."""
+    documents = make_documents(count)
+    for name in BACKENDS:
+        system = DigitalSignatureSystem(name)
+        system.generate_keys("Халіна", "10.05.2005", "секрет", verbose=False)
+        signed = [(doc, system.sign_hash(system.hash_document(doc))) for doc in documents]
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            system.verify_many(signed, workers=1)
+        t_plain = time.perf_counter() - t0
+        verifier = system.verifier(cache_size=count)
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            if not all(verifier.verify(doc, sig) for doc, sig in signed):
+                print(f"ПОМИЛКА: некоректний результат перевірки для {name}")
+                sys.exit(1)
+        t_cached = time.perf_counter() - t0
+        stats = verifier.stats()
+        print(f"{name:<8} без кешу: {count * rounds / t_plain:9.0f}/с   з кешем: {count * rounds / t_cached:9.0f}/с"
+              f"  (попадань {stats['hit_rate']:.0%}, {stats['avg_hit_ms']:.4f} мс проти {stats['avg_miss_ms']:.4f} мс)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--cache":
+        bench_cache()
+    else:
+        bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -1,23 +1,239 @@
+import argparse
 import hashlib
+import mmap
 import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+
+# ===========================================
+# Бекенди підпису: навчальний (XOR) і справжні
+# ===========================================
+
+class ToyBackend:
+    """Початкова навчальна схема: підпис = hash XOR private_key (mod 1000007)."""
+    name = "toy"
+    MODULUS = 1000007
+    PUBLIC_MULTIPLIER = 7
+
+    def generate(self, seed):
+        private_key = int.from_bytes(seed, "big") % self.MODULUS
+        return private_key, (private_key * self.PUBLIC_MULTIPLIER) % self.MODULUS
+
+    def sign(self, private_key, digest):
+        return int.from_bytes(digest, "big") ^ private_key
+
+    def verify(self, public_key, signature, digest, private_key=None):
+        # Схема не асиметрична: приватний ключ однозначно відновлюється з публічного
+        if private_key is None:
+            private_key = public_key * pow(self.PUBLIC_MULTIPLIER, -1, self.MODULUS) % self.MODULUS
+        return (signature ^ private_key) == int.from_bytes(digest, "big")
+
+    def describe(self, private_key, public_key):
+        return str(private_key), str(public_key)
+
+    def load_public(self, text):
+        return int(text)
+
+
+class Ed25519Backend:
+    """Ed25519: приватний ключ — 32-байтове зерно з персональних даних, підписується SHA-256 документу."""
+    name = "ed25519"
+
+    def generate(self, seed):
+        private_key = ed25519.Ed25519PrivateKey.from_private_bytes(seed)
+        return private_key, private_key.public_key()
+
+    def sign(self, private_key, digest):
+        return private_key.sign(digest)
+
+    def verify(self, public_key, signature, digest, private_key=None):
+        try:
+            public_key.verify(signature, digest)
+            return True
+        except InvalidSignature:
+            return False
+
+    def describe(self, private_key, public_key):
+        return "(прихований)", public_key.public_bytes(Encoding.Raw, PublicFormat.Raw).hex()
+
+    def load_public(self, text):
+        return ed25519.Ed25519PublicKey.from_public_bytes(bytes.fromhex(text))
+
+
+class ECDSABackend:
+    """ECDSA P-256 над готовим SHA-256 документу (Prehashed)."""
+    name = "ecdsa"
+    CURVE = ec.SECP256R1()
+    ORDER = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+
+    def generate(self, seed):
+        secret = int.from_bytes(seed, "big") % (self.ORDER - 1) + 1
+        private_key = ec.derive_private_key(secret, self.CURVE)
+        return private_key, private_key.public_key()
+
+    def sign(self, private_key, digest):
+        return private_key.sign(digest, ec.ECDSA(Prehashed(hashes.SHA256())))
+
+    def verify(self, public_key, signature, digest, private_key=None):
+        try:
+            public_key.verify(signature, digest, ec.ECDSA(Prehashed(hashes.SHA256())))
+            return True
+        except InvalidSignature:
+            return False
+
+    def describe(self, private_key, public_key):
+        return "(прихований)", public_key.public_bytes(Encoding.X962, PublicFormat.CompressedPoint).hex()
+
+    def load_public(self, text):
+        return ec.EllipticCurvePublicKey.from_encoded_point(self.CURVE, bytes.fromhex(text))
+
+
+CHUNK_SIZE = 1 << 20  # 1 МБ
+
+
+def hash_stream(stream, chunk_size=CHUNK_SIZE):
+    """SHA-256 бінарного потоку блоками фіксованого розміру (пам'ять не залежить від розміру файлу)."""
+    h = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        n = stream.readinto(buffer)
+        if not n:
+            break
+        h.update(view[:n])
+    return h.hexdigest()
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """SHA-256 файлу: потоково або через відображення файлу в пам'ять (mmap)."""
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h = hashlib.sha256()
+                view = memoryview(mm)
+                try:
+                    for start in range(0, len(mm), chunk_size):
+                        h.update(view[start:start + chunk_size])
+                finally:
+                    view.release()
+                return h.hexdigest()
+        return hash_stream(f, chunk_size)
+
+
+BACKENDS = {backend.name: backend for backend in (ToyBackend, Ed25519Backend, ECDSABackend)}
+
+
+@lru_cache(maxsize=256)
+def load_public_key(backend, public_text):
+    """Розбір публічного ключа з тексту (hex або число) один раз на пару (бекенд, ключ)."""
+    return BACKENDS[backend]().load_public(public_text)
+
+
+class SignatureVerifier:
+    """
+    Тиха перевірка підписів для одного публічного ключа з LRU-кешем результатів.
+    Ключ кешу — (SHA-256 документу, підпис, публічний ключ), тому повторна перевірка
+    того самого документу не виконує асиметричних операцій. Потокобезпечний.
+    """
+
+    def __init__(self, backend, public_text, cache_size=4096):
+        self.backend = BACKENDS[backend]()
+        self.public_text = public_text
+        self.public_key = load_public_key(backend, public_text)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        self.hit_seconds = self.miss_seconds = 0.0
+
+    @classmethod
+    def from_system(cls, system, cache_size=4096):
+        if not system.public_key:
+            raise ValueError("Публічний ключ відсутній!")
+        _, public_text = system.backend.describe(system.private_key, system.public_key)
+        return cls(system.backend.name, public_text, cache_size)
+
+    def verify_hash(self, doc_hash, signature):
+        """Перевірка підпису готового SHA-256 (hex)."""
+        t0 = time.perf_counter()
+        key = (doc_hash, signature, self.public_text)
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                self.hit_seconds += time.perf_counter() - t0
+                return result
+        result = self.backend.verify(self.public_key, signature, bytes.fromhex(doc_hash))
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self.misses += 1
+            self.miss_seconds += time.perf_counter() - t0
+        return result
+
+    def verify(self, content, signature):
+        """Перевірка підпису документу (str або bytes)."""
+        data = content.encode() if isinstance(content, str) else content
+        return self.verify_hash(hashlib.sha256(data).hexdigest(), signature)
+
+    def verify_file(self, path, signature, chunk_size=None, use_mmap=False):
+        return self.verify_hash(hash_file(path, chunk_size or CHUNK_SIZE, use_mmap), signature)
+
+    def stats(self):
+        """Лічильники кешу: попадання, промахи, частка попадань і середня затримка (мс)."""
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "calls": calls,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / calls if calls else 0.0,
+                "size": len(self._cache),
+                "avg_hit_ms": self.hit_seconds / self.hits * 1000 if self.hits else 0.0,
+                "avg_miss_ms": self.miss_seconds / self.misses * 1000 if self.misses else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+            self.hit_seconds = self.miss_seconds = 0.0
+
 
 class DigitalSignatureSystem:
-    def __init__(self):
-        self.MODULUS = 1000007
-        self.PUBLIC_MULTIPLIER = 7
+    def __init__(self, backend="toy"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Невідомий бекенд підпису: {backend}")
+        self.backend = BACKENDS[backend]()
+        self.MODULUS = ToyBackend.MODULUS
+        self.PUBLIC_MULTIPLIER = ToyBackend.PUBLIC_MULTIPLIER
         self.private_key = None
         self.public_key = None
         
-    def generate_keys(self, surname, birthdate, secret_word):
+    def generate_keys(self, surname, birthdate, secret_word, verbose=True):
         """Генерація пари ключів на основі персональних даних"""
         combined = f"{surname}{birthdate}{secret_word}"
         hash_obj = hashlib.sha256(combined.encode())
-        self.private_key = int(hash_obj.hexdigest(), 16) % self.MODULUS
-        self.public_key = (self.private_key * self.PUBLIC_MULTIPLIER) % self.MODULUS
+        self.private_key, self.public_key = self.backend.generate(hash_obj.digest())
+        if not verbose:
+            return
+        private_text, public_text = self.backend.describe(self.private_key, self.public_key)
         
-        print(f"\n✓ Ключі згенеровано:")
-        print(f"  Приватний ключ: {self.private_key}")
-        print(f"  Публічний ключ: {self.public_key}")
+        print(f"\n✓ Ключі згенеровано ({self.backend.name}):")
+        print(f"  Приватний ключ: {private_text}")
+        print(f"  Публічний ключ: {public_text}")
         
     def hash_document(self, content):
         """Обчислення хешу документу"""
@@ -29,37 +245,104 @@ class DigitalSignatureSystem:
             raise ValueError("Спочатку згенеруйте ключі!")
         
         doc_hash = self.hash_document(content)
-        hash_int = int(doc_hash, 16)
-        signature = hash_int ^ self.private_key
+        signature = self.backend.sign(self.private_key, bytes.fromhex(doc_hash))
         
         print(f"\n✓ Документ підписано")
         print(f"  Хеш документу: {doc_hash[:32]}...")
-        print(f"  Підпис: {signature}")
+        print(f"  Підпис: {signature.hex() if isinstance(signature, bytes) else signature}")
         
         return signature, doc_hash
     
+    def sign_hash(self, doc_hash):
+        """Підпис готового SHA-256 (hex) без виводу на екран"""
+        if not self.private_key:
+            raise ValueError("Спочатку згенеруйте ключі!")
+        return self.backend.sign(self.private_key, bytes.fromhex(doc_hash))
+    
+    def _verify_hash(self, doc_hash, signature):
+        return self.backend.verify(self.public_key, signature, bytes.fromhex(doc_hash), self.private_key)
+    
+    def sign_file(self, path, chunk_size=CHUNK_SIZE, use_mmap=False):
+        """Підпис файлу будь-якого розміру: хеш рахується блоками. Повертає (signature, doc_hash)."""
+        doc_hash = hash_file(path, chunk_size, use_mmap)
+        return self.sign_hash(doc_hash), doc_hash
+    
+    def sign_stream(self, stream, chunk_size=CHUNK_SIZE):
+        doc_hash = hash_stream(stream, chunk_size)
+        return self.sign_hash(doc_hash), doc_hash
+    
+    def verify_file(self, path, signature, original_hash=None, chunk_size=CHUNK_SIZE, use_mmap=False):
+        """Перевірка підпису файлу без виводу; original_hash (якщо заданий) теж має збігтися."""
+        if not self.public_key:
+            raise ValueError("Публічний ключ відсутній!")
+        current_hash = hash_file(path, chunk_size, use_mmap)
+        if original_hash is not None and current_hash != original_hash:
+            return False
+        return self._verify_hash(current_hash, signature)
+    
+    def verify_stream(self, stream, signature, original_hash=None, chunk_size=CHUNK_SIZE):
+        if not self.public_key:
+            raise ValueError("Публічний ключ відсутній!")
+        current_hash = hash_stream(stream, chunk_size)
+        if original_hash is not None and current_hash != original_hash:
+            return False
+        return self._verify_hash(current_hash, signature)
+    
     def verify_signature(self, content, signature, original_hash):
         """Перевірка цифрового підпису"""
         if not self.public_key:
             raise ValueError("Публічний ключ відсутній!")
         
         current_hash = self.hash_document(content)
-        decrypted = signature ^ self.private_key
-        expected_hash_int = int(original_hash, 16)
         
         print(f"\n--- Перевірка підпису ---")
         print(f"Оригінальний хеш: {original_hash[:32]}...")
         print(f"Поточний хеш:     {current_hash[:32]}...")
         
-        if current_hash == original_hash and decrypted == expected_hash_int:
+        if current_hash == original_hash and self._verify_hash(original_hash, signature):
             print("✓ Результат: Підпис ДІЙСНИЙ ✓")
             return True
         else:
             print("✗ Результат: Підпис ПІДРОБЛЕНИЙ ✗")
             return False
+    
+    def verifier(self, cache_size=4096):
+        """Тихий перевіряч з кешем для поточного публічного ключа (див. SignatureVerifier)."""
+        return SignatureVerifier.from_system(self, cache_size)
+    
+    def verify_many(self, items, workers=None):
+        """
+        Пакетна перевірка пар (документ, підпис) без виводу на екран.
+        Хешування і перевірка в cryptography відпускають GIL, тому пул потоків
+        дає реальний паралелізм. Повертає список bool у порядку вхідних пар.
+        items читається поступово: одночасно в роботі не більше 2 * workers пар.
+        """
+        if not self.public_key:
+            raise ValueError("Публічний ключ відсутній!")
+        
+        def check(item):
+            content, signature = item
+            return self._verify_hash(self.hash_document(content), signature)
+        
+        if workers == 1:
+            return [check(item) for item in items]
+        workers = workers or os.cpu_count() or 1
+        results, pending = [], deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for item in items:
+                pending.append(pool.submit(check, item))
+                if len(pending) >= workers * 2:
+                    results.append(pending.popleft().result())
+            while pending:
+                results.append(pending.popleft().result())
+        return results
 
 def main():
-    system = DigitalSignatureSystem()
+    parser = argparse.ArgumentParser(description="Система цифрових підписів")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="toy",
+                        help="схема підпису: toy (навчальна XOR), ed25519 або ecdsa")
+    args = parser.parse_args()
+    system = DigitalSignatureSystem(args.backend)
     
     print("СИСТЕМА ЦИФРОВИХ ПІДПИСІВ")
     
@@ -0,0 +1,215 @@
+"""
+Підпис і перевірка цілого дерева каталогів за маніфестом.
+
+Маніфест — JSONL: перший рядок — заголовок (бекенд, публічний ключ), далі по
+рядку на файл: шлях відносно кореня, розмір, SHA-256 та підпис, останній
+рядок — печатка: SHA-256 заголовка і всіх записів та її підпис. Підпис файлу
+покриває SHA-256(шлях + "\0" + SHA-256 вмісту), тож запис не можна перенести
+на інший шлях, а печатка виявляє видалені, додані чи змінені записи. Файли
+хешуються блоками (hash_file), тому розмір окремого файлу не обмежений
+пам'яттю. Хешування в hashlib відпускає GIL, тож файли обробляються
+паралельно в пулі потоків; одночасно в роботі не більше 2 * workers завдань.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from main import BACKENDS, CHUNK_SIZE, DigitalSignatureSystem, SignatureVerifier, hash_file
+
+
+def encode_signature(signature):
+    return signature.hex() if isinstance(signature, bytes) else signature
+
+
+def decode_signature(value):
+    return bytes.fromhex(value) if isinstance(value, str) else value
+
+
+def entry_digest(rel, doc_hash):
+    """SHA-256 (hex), який підписується для файлу: прив'язує вміст до шляху."""
+    return hashlib.sha256(f"{rel}\0{doc_hash}".encode("utf-8")).hexdigest()
+
+
+def manifest_line(record):
+    return json.dumps(record, ensure_ascii=False)
+
+
+def walk_files(root):
+    """Відносні шляхи всіх файлів дерева у стабільному порядку."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            yield os.path.relpath(full, root).replace(os.sep, "/")
+
+
+def _relative(path, root):
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(root)).replace(os.sep, "/")
+
+
+def _bounded_map(fn, items, workers):
+    """Як pool.map, але без читання всього вхідного потоку наперед."""
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def sign_tree(system, root, output_path, workers=None, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """Підписує всі файли під root і записує маніфест. Повертає (кількість файлів, байт)."""
+    def sign_one(rel):
+        full = os.path.join(root, rel)
+        doc_hash = hash_file(full, chunk_size, use_mmap)
+        signature = system.sign_hash(entry_digest(rel, doc_hash))
+        return {"path": rel, "size": os.path.getsize(full), "sha256": doc_hash,
+                "signature": encode_signature(signature)}
+
+    _, public_text = system.backend.describe(system.private_key, system.public_key)
+    files = total = 0
+    seal = hashlib.sha256()
+    with open(output_path, "w", encoding="utf-8") as out:
+        def write(record):
+            line = manifest_line(record) + "\n"
+            seal.update(line.encode("utf-8"))
+            out.write(line)
+
+        write({"backend": system.backend.name, "public_key": public_text})
+        output_rel = _relative(output_path, root)
+        paths = (rel for rel in walk_files(root) if rel != output_rel)
+        for entry in _bounded_map(sign_one, paths, workers):
+            write(entry)
+            files += 1
+            total += entry["size"]
+        digest = seal.hexdigest()
+        out.write(manifest_line({"files": files, "digest": digest,
+                                 "signature": encode_signature(system.sign_hash(digest))}) + "\n")
+    return files, total
+
+
+def read_manifest(path):
+    """(заголовок, генератор записів файлів; останній запис — печатка без "path")."""
+    f = open(path, "r", encoding="utf-8")
+    header = json.loads(f.readline())
+
+    def entries():
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    return header, entries()
+
+
+def verify_tree(verifier, root, header, entries, workers=None, chunk_size=CHUNK_SIZE, use_mmap=False,
+                exclude=()):
+    """
+    Генератор результатів перевірки: словники з path і status
+    (ok, modified, bad-signature, missing, extra — файл є на диску, але не в маніфесті;
+    для path "<маніфест>": bad-manifest — печатка відсутня, не збігається чи не пройшла перевірку).
+    verifier — SignatureVerifier (потрібен лише публічний ключ).
+    header, entries — результат read_manifest.
+    exclude — відносні шляхи, які не вважаються зайвими (наприклад, сам маніфест).
+    """
+    seen = set(exclude)
+    seal = hashlib.sha256((manifest_line(header) + "\n").encode("utf-8"))
+    sealed = []
+
+    def verify_one(entry):
+        full = os.path.join(root, entry["path"])
+        if not os.path.isfile(full):
+            return {"path": entry["path"], "status": "missing"}
+        current_hash = hash_file(full, chunk_size, use_mmap)
+        if current_hash != entry["sha256"]:
+            status = "modified"
+        elif not verifier.verify_hash(entry_digest(entry["path"], current_hash),
+                                      decode_signature(entry["signature"])):
+            status = "bad-signature"
+        else:
+            status = "ok"
+        return {"path": entry["path"], "status": status, "size": os.path.getsize(full)}
+
+    def tracked():
+        for entry in entries:
+            if sealed or "path" not in entry:
+                sealed.append(entry)  # записи після печатки теж роблять маніфест недійсним
+                continue
+            seal.update((manifest_line(entry) + "\n").encode("utf-8"))
+            seen.add(entry["path"])
+            yield entry
+
+    yield from _bounded_map(verify_one, tracked(), workers)
+    if not (len(sealed) == 1 and sealed[0].get("digest") == seal.hexdigest() and "signature" in sealed[0]
+            and verifier.verify_hash(seal.hexdigest(), decode_signature(sealed[0]["signature"]))):
+        yield {"path": "<маніфест>", "status": "bad-manifest"}
+    for rel in walk_files(root):
+        if rel not in seen:
+            yield {"path": rel, "status": "extra"}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Підпис і перевірка дерева каталогів за маніфестом.")
+    parser.add_argument("action", choices=("sign", "verify"))
+    parser.add_argument("root", help="каталог")
+    parser.add_argument("manifest", help="файл маніфесту JSONL")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="ed25519",
+                        help="схема підпису для sign (verify бере її з маніфесту)")
+    parser.add_argument("--surname")
+    parser.add_argument("--birthdate")
+    parser.add_argument("--secret")
+    parser.add_argument("--public-key", help="verify: перевіряти цим публічним ключем замість персональних даних")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="кількість потоків (0 — усі ядра)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="розмір блоку хешування, байт")
+    parser.add_argument("--mmap", action="store_true", help="читати файли через mmap")
+    args = parser.parse_args(argv)
+
+    header, entries = read_manifest(args.manifest) if args.action == "verify" else (None, None)
+    system = DigitalSignatureSystem(header["backend"] if header else args.backend)
+    if not (header and args.public_key):
+        system.generate_keys(args.surname or input("Введіть прізвище: "),
+                             args.birthdate or input("Введіть дату народження (DDMMYYYY): "),
+                             args.secret or input("Введіть секретне слово: "), verbose=False)
+    options = dict(workers=args.workers or None, chunk_size=args.chunk_size, use_mmap=args.mmap)
+
+    t0 = time.perf_counter()
+    if args.action == "sign":
+        files, total = sign_tree(system, args.root, args.manifest, **options)
+        elapsed = time.perf_counter() - t0
+        print(f"✓ Підписано файлів: {files} ({total / 1024 / 1024:.1f} МБ) за {elapsed:.2f} с")
+    else:
+        if args.public_key:
+            try:
+                verifier = SignatureVerifier(system.backend.name, args.public_key)
+            except ValueError as e:
+                print(f"✗ Некоректний публічний ключ: {e}")
+                sys.exit(1)
+        else:
+            verifier = system.verifier()
+        if verifier.public_text != header["public_key"]:
+            print("✗ Ключі не відповідають маніфесту")
+            sys.exit(1)
+        counts = {}
+        total = 0
+        for res in verify_tree(verifier, args.root, header, entries, exclude=(_relative(args.manifest, args.root),),
+                               **options):
+            counts[res["status"]] = counts.get(res["status"], 0) + 1
+            total += res.get("size", 0)
+            if res["status"] != "ok":
+                print(f"✗ {res['path']}: {res['status']}")
+        elapsed = time.perf_counter() - t0
+        summary = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items()))
+        print(f"Результат: {summary or 'файлів немає'}; {total / 1024 / 1024:.1f} МБ за {elapsed:.2f} с")
+        if set(counts) - {"ok"}:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,104 @@
+"""
+Асинхронний API шифрування/розшифрування повідомлень для asyncio.
+
+* KDF (сотні мілісекунд CPU) і Fernet для великих повідомлень виконуються
+  в пулі потоків, тож цикл подій не блокується;
+* одночасні запити з тими самими (email, personal_string, профіль KDF)
+  чекають одного спільного виведення ключа замість запуску власного;
+* max_concurrency обмежує кількість одночасних операцій, max_kdf — кількість
+  одночасних виведень ключа (кожне навантажує ядро CPU і, для Scrypt/Argon2, пам'ять).
+Готові ключі зберігаються в KeyRing (за замовчуванням DEFAULT_KEYRING).
+"""
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+from cryptography.fernet import Fernet
+
+from main import DEFAULT_KEYRING, KDF_SEPARATOR, KeyRing, get_profile, split_kdf
+
+
+class AsyncMailCrypto:
+    def __init__(self, max_concurrency: int = 64, max_kdf: Optional[int] = None,
+                 executor: Optional[Executor] = None, keyring: KeyRing = DEFAULT_KEYRING,
+                 offload_threshold: int = 64 * 1024):
+        self.keyring = keyring
+        self._owns_executor = executor is None  # чужий пул закриває той, хто його створив
+        self.executor = executor or ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                       thread_name_prefix="lab05-crypto")
+        self.offload_threshold = offload_threshold  # менші повідомлення шифруються прямо в циклі подій
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._kdf_limit = asyncio.Semaphore(max_kdf or os.cpu_count() or 1)
+        self._inflight = {}
+        self.derivations = self.coalesced = self.active = self.peak_active = 0
+
+    async def fernet(self, email: str, personal_string: str, profile=None) -> Fernet:
+        """Fernet з кешу або спільного для всіх очікувачів виведення ключа."""
+        profile = get_profile(profile)
+        cached = self.keyring.peek(email, personal_string, profile)
+        if cached is not None:
+            return cached
+        slot = self.keyring.fingerprint(email, personal_string, profile)
+        task = self._inflight.get(slot)
+        if task is None:
+            task = asyncio.ensure_future(self._derive(email, personal_string, profile))
+            self._inflight[slot] = task
+            task.add_done_callback(lambda done: self._inflight.pop(slot, None))
+            self.derivations += 1
+        else:
+            self.coalesced += 1
+        # shield: скасування одного очікувача не скасовує спільне виведення для інших
+        return await asyncio.shield(task)
+
+    async def _derive(self, email: str, personal_string: str, profile) -> Fernet:
+        async with self._kdf_limit:
+            loop = asyncio.get_running_loop()
+            # Промах уже врахований у fernet() через peek
+            return await loop.run_in_executor(self.executor, self.keyring.get, email, personal_string, profile, False)
+
+    async def _run(self, fn, data):
+        if len(data) < self.offload_threshold:
+            return fn(data)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, data)
+
+    async def _limited(self, coro):
+        async with self._limit:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            try:
+                return await coro
+            finally:
+                self.active -= 1
+
+    async def encrypt_message(self, email: str, personal_string: str, plaintext: str, profile=None) -> str:
+        """Асинхронний аналог main.encrypt_message (той самий формат результату)."""
+        async def run():
+            f = await self.fernet(email, personal_string, profile)
+            token = (await self._run(f.encrypt, plaintext.encode("utf-8"))).decode("utf-8")
+            if profile is None:
+                return token
+            return get_profile(profile).spec() + KDF_SEPARATOR + token
+        return await self._limited(run())
+
+    async def decrypt_message(self, email: str, personal_string: str, encrypted_text: str) -> str:
+        """Асинхронний аналог main.decrypt_message."""
+        async def run():
+            profile, token = split_kdf(encrypted_text)
+            f = await self.fernet(email, personal_string, profile)
+            return (await self._run(f.decrypt, token.encode("utf-8"))).decode("utf-8")
+        return await self._limited(run())
+
+    def stats(self) -> dict:
+        return {
+            "derivations": self.derivations,
+            "coalesced": self.coalesced,
+            "in_flight_kdf": len(self._inflight),
+            "active": self.active,
+            "peak_active": self.peak_active,
+            "keyring": self.keyring.stats(),
+        }
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
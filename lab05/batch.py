@@ -0,0 +1,227 @@
+"""
+Пакетне шифрування поштових архівів у записи EncryptedEmail.
+
+Вхід читається потоково: JSONL (from, to, subject, body, attachment — шлях
+до файлу), mbox або maildir (модуль mailbox). Для листів з вкладеннями з
+mbox/maildir у encrypted_attachment шифрується весь вихідний лист (RFC 822),
+щоб не втратити жодної частини. Листи групуються в пакети по chunk_size і
+шифруються в пулі процесів (або потоків); одночасно в роботі не більше
+2 * workers пакетів, тому пам'ять обмежена незалежно від розміру архіву.
+Результат — JSONL-сховище, по одному EncryptedEmail на рядок, у порядку входу.
+"""
+import argparse
+import json
+import mailbox
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from email.header import decode_header, make_header
+from email.message import Message
+from typing import Iterable, Iterator, Optional
+
+from main import KDF_PROFILES, EncryptedEmail, create_fernet_from_user_data, get_profile
+
+_worker_credentials = None
+
+
+# ==========================
+# Читання вхідних архівів
+# ==========================
+
+def _message_body(msg: Message) -> str:
+    parts = msg.walk() if msg.is_multipart() else [msg]
+    texts = []
+    for part in parts:
+        if part.get_content_type() == "text/plain" and not part.get_filename():
+            payload = part.get_payload(decode=True) or b""
+            texts.append(payload.decode(part.get_content_charset() or "utf-8", errors="replace"))
+    return "\n".join(texts)
+
+
+def _has_attachments(msg: Message) -> bool:
+    return any(part.get_filename() or part.get_content_disposition() == "attachment" for part in msg.walk())
+
+
+def _header(msg: Message, name: str) -> str:
+    """Заголовок з декодуванням MIME encoded-words (=?utf-8?b?...?=)."""
+    value = msg.get(name)
+    return str(make_header(decode_header(str(value)))) if value is not None else ""
+
+
+def _from_message(msg: Message) -> dict:
+    return {
+        "from": _header(msg, "From"),
+        "to": _header(msg, "To"),
+        "subject": _header(msg, "Subject"),
+        "body": _message_body(msg),
+        "attachment": msg.as_bytes() if _has_attachments(msg) else None,
+    }
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            attachment = None
+            if item.get("attachment"):
+                with open(item["attachment"], "rb") as f_att:
+                    attachment = f_att.read()
+            yield {"from": item.get("from", ""), "to": item.get("to", ""), "subject": item.get("subject", ""),
+                   "body": item.get("body", ""), "attachment": attachment}
+
+
+def read_messages(path: str, fmt: str = "auto") -> Iterator[dict]:
+    """Потоково читає листи архіву як словники from/to/subject/body/attachment."""
+    if fmt == "auto":
+        fmt = "maildir" if os.path.isdir(path) else "jsonl" if path.endswith(".jsonl") else "mbox"
+    if fmt == "jsonl":
+        yield from read_jsonl(path)
+        return
+    box = mailbox.Maildir(path, create=False) if fmt == "maildir" else mailbox.mbox(path, create=False)
+    try:
+        for key in box.iterkeys():
+            yield _from_message(box.get_message(key))
+    finally:
+        box.close()
+
+
+# =========================
+# Шифрування в пулі
+# =========================
+
+def _init_worker(email: str, personal_string: str, kdf: Optional[str] = None) -> None:
+    global _worker_credentials
+    _worker_credentials = (email, personal_string, kdf)
+    create_fernet_from_user_data(email, personal_string, profile=kdf)  # KDF один раз на процес
+
+
+def encrypt_messages(messages: list, credentials: Optional[tuple] = None) -> list:
+    """Шифрує пакет листів, повертає список EncryptedEmail. credentials — (email, personal_string, spec KDF)."""
+    email, personal_string, kdf = credentials or _worker_credentials
+    fernet = create_fernet_from_user_data(email, personal_string, profile=kdf)
+    records = []
+    for msg in messages:
+        attachment = msg.get("attachment")
+        records.append(EncryptedEmail(
+            from_email=msg["from"],
+            to_email=msg["to"],
+            subject=msg["subject"],
+            encrypted_body=fernet.encrypt(msg["body"].encode("utf-8")).decode("utf-8"),
+            encrypted_attachment=fernet.encrypt(attachment) if attachment is not None else None,
+            kdf=kdf,
+        ))
+    return records
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_pipeline(messages: Iterable[dict], email: str, personal_string: str, workers: Optional[int] = None,
+                 chunk_size: int = 64, threads: bool = False, kdf: Optional[str] = None) -> Iterator[EncryptedEmail]:
+    """
+    Генератор EncryptedEmail у порядку входу. threads=True — пул потоків
+    (спільний кеш ключів, без копіювання даних між процесами).
+    kdf — spec профілю KDF (записується в кожен EncryptedEmail), None — за замовчуванням.
+    """
+    workers = workers or os.cpu_count() or 1
+    if threads:
+        create_fernet_from_user_data(email, personal_string, profile=kdf)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        credentials = (email, personal_string, kdf)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(email, personal_string, kdf))
+        credentials = None
+    pending = deque()
+    with pool:
+        for chunk in _chunks(messages, chunk_size):
+            pending.append(pool.submit(encrypt_messages, chunk, credentials))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# =====================
+# Сховище JSONL
+# =====================
+
+def record_to_json(record: EncryptedEmail) -> str:
+    data = asdict(record)
+    if record.encrypted_attachment is not None:
+        data["encrypted_attachment"] = record.encrypted_attachment.decode("ascii")  # токен Fernet уже base64
+    return json.dumps(data, ensure_ascii=False)
+
+
+def read_store(path: str) -> Iterator[EncryptedEmail]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                if data.get("encrypted_attachment") is not None:
+                    data["encrypted_attachment"] = data["encrypted_attachment"].encode("ascii")
+                yield EncryptedEmail(**data)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Пакетне шифрування поштового архіву в записи EncryptedEmail.")
+    parser.add_argument("action", choices=("encrypt", "decrypt"))
+    parser.add_argument("input", help="encrypt: mbox, каталог maildir або JSONL; decrypt: сховище JSONL")
+    parser.add_argument("-o", "--output", default="-", help="вихідний JSONL, '-' — stdout")
+    parser.add_argument("-f", "--format", choices=("auto", "jsonl", "mbox", "maildir"), default="auto")
+    parser.add_argument("--email", required=True, help="email власника архіву (сіль)")
+    parser.add_argument("--personal", help="персональний рядок (якщо не задано — буде запитано)")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="кількість процесів/потоків (0 — усі ядра)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="листів в одному завданні пулу")
+    parser.add_argument("--threads", action="store_true", help="пул потоків замість процесів")
+    parser.add_argument("--kdf", help=f"профіль KDF ({', '.join(KDF_PROFILES)}) або spec, напр. pbkdf2:iterations=600000")
+    args = parser.parse_args(argv)
+    personal = args.personal or input("Введіть персональний рядок: ")
+    kdf = get_profile(args.kdf).spec() if args.kdf else None
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    count = total_bytes = 0
+    t0 = time.perf_counter()
+    try:
+        if args.action == "encrypt":
+            for record in run_pipeline(read_messages(args.input, args.format), args.email, personal,
+                                       args.workers or None, args.chunk_size, args.threads, kdf):
+                line = record_to_json(record)
+                out.write(line + "\n")
+                count += 1
+                total_bytes += len(line)
+        else:
+            for record in read_store(args.input):
+                fernet = create_fernet_from_user_data(args.email, personal, profile=record.kdf)
+                body = fernet.decrypt(record.encrypted_body.encode("utf-8")).decode("utf-8")
+                has_attachment = record.encrypted_attachment is not None
+                attachment_size = len(fernet.decrypt(record.encrypted_attachment)) if has_attachment else None
+                out.write(json.dumps({"from": record.from_email, "to": record.to_email, "subject": record.subject,
+                                      "body": body, "attachment_size": attachment_size}, ensure_ascii=False) + "\n")
+                count += 1
+                total_bytes += len(record.encrypted_body)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - t0
+    print(f"Оброблено листів: {count} за {elapsed:.2f} с", file=sys.stderr)
+    if elapsed > 0:
+        print(f"Швидкість: {count / elapsed:.1f} листів/с, {total_bytes / 1024 / 1024 / elapsed:.1f} МБ/с",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
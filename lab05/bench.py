@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from main import (DEFAULT_KEYRING, KdfProfile, KeyRing, create_fernet_from_user_data, decrypt_file,
+                  decrypt_message, encrypt_file, encrypt_message, split_kdf)
+from aio import AsyncMailCrypto
+from streaming import decrypt_file_stream, encrypt_file_stream
+
+EMAIL = "olgakhalina3@gmail.com"
+PERSONAL = "OlhaKhalina2005"
+MESSAGE = "Зустрічаємося завтра о 15:00. " * 10
+
+
+def bench_keyring(uncached=10, cached=5000):
+    """Повідомлень за секунду: PBKDF2 на кожен виклик проти кешу ключів."""
+    # Як до кешу: кожен виклик виводить ключ заново
+    t0 = time.perf_counter()
+    for _ in range(uncached):
+        token = create_fernet_from_user_data(EMAIL, PERSONAL, cache=False).encrypt(MESSAGE.encode("utf-8"))
+        plain = create_fernet_from_user_data(EMAIL, PERSONAL, cache=False).decrypt(token)
+        assert plain.decode("utf-8") == MESSAGE
+    t_before = (time.perf_counter() - t0) / uncached
+
+    DEFAULT_KEYRING.clear()
+    t0 = time.perf_counter()
+    for _ in range(cached):
+        assert decrypt_message(EMAIL, PERSONAL, encrypt_message(EMAIL, PERSONAL, MESSAGE)) == MESSAGE
+    t_after = (time.perf_counter() - t0) / cached
+    print(f"encrypt+decrypt без кешу: {1 / t_before:10.1f} повідомлень/с ({t_before * 1000:.1f} мс)")
+    print(f"encrypt+decrypt з кешем:  {1 / t_after:10.1f} повідомлень/с ({t_after * 1000:.3f} мс)"
+          f"  x{t_before / t_after:.0f}, {DEFAULT_KEYRING.stats()}")
+
+
+def check_eviction():
+    """Перевірка TTL, обмеження розміру та затирання ключів."""
+    now = [0.0]
+    ring = KeyRing(max_entries=2, ttl=10, clock=lambda: now[0])
+    first = ring.get("a@x", "1")
+    raw_key = next(iter(ring._entries.values()))[1]
+    assert ring.get("a@x", "1") is first
+    ring.get("b@x", "2")
+    ring.get("c@x", "3")
+    assert raw_key == bytes(len(raw_key)), "витіснений ключ не затерто"
+    now[0] = 11
+    assert ring.get("c@x", "3") is not None and ring.stats()["size"] == 1
+    print(f"Витіснення/TTL: OK {ring.stats()}")
+
+
+def check_kdf_limits():
+    """Spec з шифротексту з параметрами на гігабайти пам'яті чи хвилини обчислень відкидається до KDF."""
+    hostile = ["scrypt:n=1048576,p=16,r=32", "scrypt:n=1048576,p=1,r=32", "scrypt:n=1048576,p=1,r=8",
+               "argon2id:iterations=64,lanes=64,memory_cost=1048576", "pbkdf2:iterations=10000000"]
+    for spec in hostile:
+        try:
+            split_kdf(spec + "$gAAAAA")
+        except ValueError:
+            continue
+        print(f"ПОМИЛКА: прийнято небезпечний spec {spec}")
+        sys.exit(1)
+    KdfProfile.parse("scrypt:n=262144,p=1,r=8")  # рівно 256 МБ — ще дозволено
+    print(f"Межі KDF: OK ({len(hostile)} небезпечних spec відкинуто)")
+
+
+def measured(fn, *args):
+    """(результат, секунди, пік пам'яті Python у МБ)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        result = fn(*args)
+        return result, time.perf_counter() - t0, tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def fernet_file_roundtrip(src, enc, out):
+    token = encrypt_file(EMAIL, PERSONAL, src)
+    with open(enc, "wb") as f:
+        f.write(token)
+    del token
+    with open(enc, "rb") as f:
+        decrypt_file(EMAIL, PERSONAL, f.read(), out)
+
+
+def stream_file_roundtrip(src, enc, out):
+    encrypt_file_stream(EMAIL, PERSONAL, src, enc)
+    decrypt_file_stream(EMAIL, PERSONAL, enc, out)
+
+
+def bench_stream(sizes_mb=(16, 128)):
+    """Fernet (увесь файл у пам'яті) проти потокового формату: швидкість і пік пам'яті."""
+    create_fernet_from_user_data(EMAIL, PERSONAL)  # ключ виводиться один раз, поза вимірюванням
+    with tempfile.TemporaryDirectory() as tmp:
+        src, enc, out = (os.path.join(tmp, name) for name in ("src", "enc", "out"))
+        for size_mb in sizes_mb:
+            with open(src, "wb") as f:
+                for _ in range(size_mb):
+                    f.write(os.urandom(1024 * 1024))
+            for name, fn in (("Fernet", fernet_file_roundtrip), ("потоковий", stream_file_roundtrip)):
+                _, seconds, peak = measured(fn, src, enc, out)
+                with open(src, "rb") as a, open(out, "rb") as b:
+                    while True:
+                        x, y = a.read(1 << 20), b.read(1 << 20)
+                        if x != y:
+                            print(f"ПОМИЛКА: {name} — результат відрізняється від оригіналу")
+                            sys.exit(1)
+                        if not x:
+                            break
+                print(f"{size_mb:4d} МБ {name:<10} encrypt+decrypt {size_mb / seconds:7.1f} МБ/с, "
+                      f"пік пам'яті {peak:7.1f} МБ, розмір шифротексту {os.path.getsize(enc) / size_mb / 1024 / 1024:.3f}x")
+
+
+async def _load_test(requests, users, max_concurrency):
+    crypto = AsyncMailCrypto(max_concurrency=max_concurrency, keyring=KeyRing(max_entries=users * 2))
+    credentials = [(f"user{i}@example.com", f"secret-{i}") for i in range(users)]
+    latencies = []
+    lag = [0.0]
+    stop = asyncio.Event()
+
+    async def ticker():
+        # Затримка циклу подій: наскільки пізніше запланованого прокидається sleep(0.01)
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag[0] = max(lag[0], time.perf_counter() - t0 - 0.01)
+
+    async def request(i):
+        email, personal = credentials[i % users]
+        t0 = time.perf_counter()
+        token = await crypto.encrypt_message(email, personal, MESSAGE)
+        assert await crypto.decrypt_message(email, personal, token) == MESSAGE
+        latencies.append(time.perf_counter() - t0)
+
+    tick = asyncio.ensure_future(ticker())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await tick
+    crypto.close()
+    latencies.sort()
+    stats = crypto.stats()
+    print(f"{requests} запитів, {users} користувачів, ліміт {max_concurrency}: {elapsed:.2f} с, "
+          f"{requests / elapsed:.0f} запитів/с")
+    print(f"  затримка p50 {latencies[len(latencies) // 2] * 1000:.1f} мс, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} мс; "
+          f"макс. блокування циклу подій {lag[0] * 1000:.1f} мс")
+    print(f"  виведень ключа: {stats['derivations']} (об'єднано запитів: {stats['coalesced']}), "
+          f"пік одночасних операцій: {stats['peak_active']}")
+    if stats["derivations"] != users:
+        print("ПОМИЛКА: одночасні запити не об'єдналися в одне виведення ключа")
+        sys.exit(1)
+
+
+def bench_async(requests=5000, users=8, max_concurrency=256):
+    """Навантажувальний тест асинхронного API: багато одночасних запитів, холодний кеш ключів."""
+    asyncio.run(_load_test(requests, users, max_concurrency))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--async":
+        bench_async(*(int(x) for x in sys.argv[2:5]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "--stream":
+        bench_stream(tuple(int(x) for x in sys.argv[2:]) or (16, 128))
+    else:
+        check_eviction()
+        check_kdf_limits()
+        bench_keyring(*(int(x) for x in sys.argv[1:3]))
@@ -0,0 +1,97 @@
+"""
+Калібрування профілів KDF на цьому комп'ютері.
+
+python kdf.py bench                    — час виведення ключа для кожного профілю KDF_PROFILES;
+python kdf.py calibrate [--target-ms N] — підбирає параметри PBKDF2, Scrypt і (якщо доступний)
+                                          Argon2id так, щоб одне виведення тривало приблизно N мс.
+Отриманий spec можна передати як profile= у функції main.py або в batch.py --kdf.
+"""
+import argparse
+import sys
+import time
+
+from main import KDF_PROFILES, Argon2id, KdfProfile
+
+SALT = b"calibration@example.com"
+SECRET = b"calibration-secret"
+
+
+def measure(profile: KdfProfile, repeat: int = 3) -> float:
+    """Найкращий із repeat замірів, секунди."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        profile.derive(SALT, SECRET)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def calibrate_pbkdf2(target: float) -> KdfProfile:
+    # Час PBKDF2 лінійний за кількістю ітерацій
+    probe = KdfProfile.create("pbkdf2", iterations=200000)
+    iterations = int(200000 * target / measure(probe)) // 10000 * 10000
+    low, high = KdfProfile.LIMITS["pbkdf2"]["iterations"]
+    return KdfProfile.create("pbkdf2", iterations=min(max(iterations, low), high))
+
+
+def calibrate_scrypt(target: float, r: int = 8, p: int = 1,
+                     max_memory_mb: int = KdfProfile.MAX_SCRYPT_MEMORY // 1024 // 1024) -> KdfProfile:
+    # n — степінь двійки; пам'ять = 128 * n * r байт. Подвоюємо n, поки не досягнемо цілі
+    low, high = KdfProfile.LIMITS["scrypt"]["n"]
+    best = KdfProfile.create("scrypt", n=low, r=r, p=p)
+    n = low
+    while n <= high and 128 * n * r <= max_memory_mb * 1024 * 1024:
+        profile = KdfProfile.create("scrypt", n=n, r=r, p=p)
+        best = profile
+        if measure(profile, repeat=1) >= target:
+            break
+        n *= 2
+    return best
+
+
+def calibrate_argon2id(target: float, memory_mb: int = 64, lanes: int = 4) -> KdfProfile:
+    # Підбирається кількість проходів (лінійна за часом); якщо вже один прохід
+    # довший за ціль, пам'ять зменшується вдвічі, але не нижче мінімуму LIMITS
+    memory_cost = memory_mb * 1024
+    min_memory = KdfProfile.LIMITS["argon2id"]["memory_cost"][0]
+    while True:
+        probe = KdfProfile.create("argon2id", iterations=1, lanes=lanes, memory_cost=memory_cost)
+        one_pass = measure(probe)
+        if one_pass <= target or memory_cost // 2 < min_memory:
+            break
+        memory_cost //= 2
+    low, high = KdfProfile.LIMITS["argon2id"]["iterations"]
+    iterations = min(max(round(target / one_pass), low), high)
+    return KdfProfile.create("argon2id", iterations=iterations, lanes=lanes, memory_cost=memory_cost)
+
+
+def calibrate(target_ms: float) -> list:
+    target = target_ms / 1000
+    profiles = [calibrate_pbkdf2(target), calibrate_scrypt(target)]
+    if Argon2id is not None:
+        profiles.append(calibrate_argon2id(target))
+    return profiles
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Вимірювання та калібрування профілів KDF.")
+    parser.add_argument("action", choices=("bench", "calibrate"))
+    parser.add_argument("--target-ms", type=float, default=250, help="бажаний час одного виведення ключа, мс")
+    args = parser.parse_args(argv)
+
+    if args.action == "bench":
+        for name, profile in KDF_PROFILES.items():
+            print(f"{name:<14} {profile.spec():<48} {measure(profile) * 1000:8.1f} мс")
+    else:
+        print(f"Ціль: {args.target_ms:.0f} мс на виведення ключа")
+        for profile in calibrate(args.target_ms):
+            elapsed = measure(profile) * 1000
+            print(f"{profile.spec():<48} {elapsed:8.1f} мс")
+            if elapsed > args.target_ms * 1.5:
+                print(f"  ціль {args.target_ms:.0f} мс недосяжна: це вже мінімальні допустимі параметри {profile.algorithm}")
+        if Argon2id is None:
+            print("Argon2id недоступний у цій версії cryptography (потрібна 44+)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,39 +1,266 @@
 import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+try:
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+except ImportError:  # cryptography < 44
+    Argon2id = None
+
+
+# =====================================
+# Профілі KDF (функцій виведення ключа)
+# =====================================
+
+@dataclass(frozen=True)
+class KdfProfile:
+    """
+    Алгоритм і параметри виведення ключа. Текстовий запис spec()
+    (наприклад, 'scrypt:n=32768,p=1,r=8') зберігається разом із шифротекстом,
+    щоб розшифрування використало ті самі параметри.
+    """
+    algorithm: str                          # pbkdf2 | scrypt | argon2id
+    params: Tuple[Tuple[str, int], ...]
+
+    # Допустимі межі параметрів: spec читається з шифротексту, тому верхні межі —
+    # кілька разів від найсильнішого профілю KDF_PROFILES, а не те, що дозволяє бібліотека
+    LIMITS = {
+        "pbkdf2": {"iterations": (1000, 5_000_000)},
+        "scrypt": {"n": (2 ** 10, 2 ** 20), "r": (1, 32), "p": (1, 4)},
+        "argon2id": {"iterations": (1, 8), "lanes": (1, 16), "memory_cost": (8 * 1024, 256 * 1024)},
+    }
+    MAX_SCRYPT_MEMORY = 256 * 1024 * 1024  # 128 * n * r байт; n і r окремо дозволяють набагато більше
+
+    @classmethod
+    def create(cls, algorithm: str, **params: int) -> "KdfProfile":
+        if algorithm not in cls.LIMITS:
+            raise ValueError(f"Невідомий алгоритм KDF: {algorithm}")
+        if algorithm == "argon2id" and Argon2id is None:
+            raise ValueError("Argon2id недоступний у цій версії cryptography")
+        limits = cls.LIMITS[algorithm]
+        if set(params) != set(limits):
+            raise ValueError(f"{algorithm}: потрібні параметри {', '.join(sorted(limits))}")
+        for name, (low, high) in limits.items():
+            if not low <= params[name] <= high:
+                raise ValueError(f"{algorithm}: {name}={params[name]} поза межами [{low}, {high}]")
+        if algorithm == "scrypt" and params["n"] & (params["n"] - 1):
+            raise ValueError("scrypt: n має бути степенем двійки")
+        if algorithm == "scrypt" and 128 * params["n"] * params["r"] > cls.MAX_SCRYPT_MEMORY:
+            raise ValueError(f"scrypt: 128 * n * r перевищує {cls.MAX_SCRYPT_MEMORY // 1024 // 1024} МБ пам'яті")
+        return cls(algorithm, tuple(sorted(params.items())))
+
+    @classmethod
+    def parse(cls, spec: str) -> "KdfProfile":
+        algorithm, _, args = spec.partition(":")
+        params = {}
+        for item in filter(None, args.split(",")):
+            name, _, value = item.partition("=")
+            params[name] = int(value)
+        return cls.create(algorithm, **params)
+
+    def spec(self) -> str:
+        return f"{self.algorithm}:" + ",".join(f"{name}={value}" for name, value in self.params)
+
+    def derive(self, salt: bytes, secret: bytes) -> bytes:
+        """Сирий 256-бітний ключ."""
+        p = dict(self.params)
+        if self.algorithm == "pbkdf2":
+            kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=p["iterations"])
+        elif self.algorithm == "scrypt":
+            kdf = Scrypt(salt=salt, length=32, n=p["n"], r=p["r"], p=p["p"])
+        else:
+            # Argon2 вимагає сіль щонайменше 8 байт, тому email попередньо хешується
+            kdf = Argon2id(salt=hashlib.sha256(salt).digest(), length=32, iterations=p["iterations"],
+                           lanes=p["lanes"], memory_cost=p["memory_cost"])
+        return kdf.derive(secret)
+
+
+DEFAULT_PROFILE = KdfProfile.create("pbkdf2", iterations=390000)
+
+KDF_PROFILES = {
+    "default": DEFAULT_PROFILE,
+    "pbkdf2-fast": KdfProfile.create("pbkdf2", iterations=100000),
+    "pbkdf2-strong": KdfProfile.create("pbkdf2", iterations=1200000),
+    "scrypt": KdfProfile.create("scrypt", n=2 ** 15, r=8, p=1),           # 32 МБ пам'яті
+    "scrypt-strong": KdfProfile.create("scrypt", n=2 ** 17, r=8, p=1),    # 128 МБ пам'яті
+}
+if Argon2id is not None:
+    KDF_PROFILES["argon2id"] = KdfProfile.create("argon2id", iterations=3, lanes=4, memory_cost=64 * 1024)
+
+
+def get_profile(profile=None) -> KdfProfile:
+    """None, назва з KDF_PROFILES, spec-рядок або KdfProfile -> KdfProfile."""
+    if profile is None:
+        return DEFAULT_PROFILE
+    if isinstance(profile, KdfProfile):
+        return profile
+    return KDF_PROFILES[profile] if profile in KDF_PROFILES else KdfProfile.parse(profile)
 
 
 # =====================================
 # Генерація ключа з персональних даних
 # =====================================
 
-def derive_key_from_personal_data(email: str, personal_string: str) -> bytes:
+def derive_key_from_personal_data(email: str, personal_string: str, profile=None) -> bytes:
     """
     Генерує симетричний ключ на основі персональних даних користувача.
     - email використовується як 'salt'
     - personal_string – секретна фраза/пароль (наприклад, 'OlhaKhalina2005')
+    - profile – профіль KDF (за замовчуванням PBKDF2-SHA256, 390000 ітерацій)
     """
     salt = email.encode("utf-8")
     personal_bytes = personal_string.encode("utf-8")
 
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,           # 256-бітний ключ
-        salt=salt,
-        iterations=390000,   # кількість ітерацій для захисту від перебору
-    )
-
-    raw_key = kdf.derive(personal_bytes)
+    raw_key = get_profile(profile).derive(salt, personal_bytes)
     fernet_key = base64.urlsafe_b64encode(raw_key)
     return fernet_key
 
 
-def create_fernet_from_user_data(email: str, personal_string: str) -> Fernet:
-    key = derive_key_from_personal_data(email, personal_string)
+# ==========================================
+# Кеш похідних ключів (сесійна "в'язка")
+# ==========================================
+
+class KeyRing:
+    """
+    Обмежене сховище Fernet-об'єктів у пам'яті: KDF виконується один раз
+    на пару (email, personal_string), далі повертається готовий Fernet.
+
+    - не більше max_entries записів (витісняється найдавніше використаний);
+    - запис живе ttl секунд від моменту виведення ключа;
+    - ключ запису — HMAC від даних користувача з випадковим ключем процесу,
+      тому персональний рядок у сховищі не зберігається;
+    - при витісненні сирий ключ у bytearray перезаписується нулями
+      (копії всередині Fernet/OpenSSL Python затерти не дозволяє, тож це
+      найкраще можливе очищення).
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: float = 300.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._pepper = os.urandom(32)
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def _slot(self, email: str, personal_string: str, profile: KdfProfile) -> bytes:
+        data = "\0".join((profile.spec(), email, personal_string)).encode("utf-8")
+        return hmac.new(self._pepper, data, hashlib.sha256).digest()
+
+    @staticmethod
+    def _wipe(entry: tuple) -> None:
+        raw_key = entry[1]
+        raw_key[:] = bytes(len(raw_key))
+
+    def get(self, email: str, personal_string: str, profile=None, counted: bool = True) -> Fernet:
+        """counted=False — звертання вже враховане в hits/misses попереднім peek."""
+        return self._entry(email, personal_string, get_profile(profile), counted)[0]
+
+    def fingerprint(self, email: str, personal_string: str, profile=None) -> bytes:
+        """Ідентифікатор запису (HMAC), за яким можна групувати запити без персональних даних."""
+        return self._slot(email, personal_string, get_profile(profile))
+
+    def peek(self, email: str, personal_string: str, profile=None) -> Optional[Fernet]:
+        """Fernet з кешу без виведення ключа; None, якщо запису немає або строк минув."""
+        slot = self._slot(email, personal_string, get_profile(profile))
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is None or entry[0] <= self._clock():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            return entry[2]
+
+    def master_key(self, email: str, personal_string: str, profile=None) -> bytes:
+        """Сирий 256-бітний ключ KDF (для виведення ключів потокового формату)."""
+        return base64.urlsafe_b64decode(self._entry(email, personal_string, get_profile(profile))[1])
+
+    def _entry(self, email: str, personal_string: str, profile: KdfProfile, counted: bool = True) -> tuple:
+        """
+        (Fernet, копія сирого ключа). Копія робиться під блокуванням: після його
+        зняття інший потік може витіснити запис і затерти bytearray нулями.
+        """
+        slot = self._slot(email, personal_string, profile)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(slot)
+                self.hits += counted
+                return entry[2], bytes(entry[1])
+            if entry is not None:
+                self._wipe(self._entries.pop(slot))
+                self.evictions += 1
+            self.misses += counted
+
+        # Повільний KDF — поза блокуванням, щоб не затримувати інші ключі
+        raw_key = bytearray(derive_key_from_personal_data(email, personal_string, profile))
+        fernet = Fernet(bytes(raw_key))
+        with self._lock:
+            old = self._entries.pop(slot, None)
+            if old is not None:
+                self._wipe(old)
+            entry = (now + self.ttl, raw_key, fernet)
+            self._entries[slot] = entry
+            result = fernet, bytes(raw_key)
+            self._evict(now)
+        return result
+
+    def _evict(self, now: float) -> None:
+        expired = [slot for slot, entry in self._entries.items() if entry[0] <= now]
+        for slot in expired:
+            self._wipe(self._entries.pop(slot))
+            self.evictions += 1
+        while len(self._entries) > self.max_entries:
+            _, entry = self._entries.popitem(last=False)
+            self._wipe(entry)
+            self.evictions += 1
+
+    def purge_expired(self) -> None:
+        with self._lock:
+            self._evict(self._clock())
+
+    def clear(self) -> None:
+        """Видаляє та затирає всі ключі (наприклад, при завершенні сесії)."""
+        with self._lock:
+            while self._entries:
+                self._wipe(self._entries.popitem()[1])
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / calls if calls else 0.0,
+            }
+
+
+DEFAULT_KEYRING = KeyRing()
+
+
+def create_fernet_from_user_data(email: str, personal_string: str, cache: bool = True, profile=None) -> Fernet:
+    """
+    Fernet для даних користувача. За замовчуванням ключ береться з DEFAULT_KEYRING;
+    cache=False — завжди виконувати KDF заново.
+    """
+    if cache:
+        return DEFAULT_KEYRING.get(email, personal_string, profile)
+    key = derive_key_from_personal_data(email, personal_string, profile)
     return Fernet(key)
 
 
@@ -48,47 +275,65 @@ class EncryptedEmail:
     subject: str
     encrypted_body: str            # зашифрований текст повідомлення (base64-рядок)
     encrypted_attachment: Optional[bytes] = None  # опційно: зашифрований файл (якщо є)
+    kdf: Optional[str] = None      # параметри KDF (spec), None — профіль за замовчуванням
 
 
 # ===================================
 # Функції шифрування / розшифрування
 # ===================================
 
-def encrypt_message(email: str, personal_string: str, plaintext: str) -> str:
+KDF_SEPARATOR = "$"  # не входить в алфавіт base64url, тому не плутається з токеном
+
+
+def split_kdf(data: str):
+    """'spec$token' -> (KdfProfile, token); токен без префікса — профіль за замовчуванням."""
+    spec, sep, token = data.rpartition(KDF_SEPARATOR)
+    return (KdfProfile.parse(spec) if sep else DEFAULT_PROFILE), token
+
+
+def encrypt_message(email: str, personal_string: str, plaintext: str, profile=None) -> str:
     """
     Шифрує текст повідомлення, повертає base64-рядок (token Fernet).
+    Якщо задано profile, перед токеном записуються параметри KDF: 'spec$token'.
     """
-    f = create_fernet_from_user_data(email, personal_string)
-    token = f.encrypt(plaintext.encode("utf-8"))
-    return token.decode("utf-8")
+    f = create_fernet_from_user_data(email, personal_string, profile=profile)
+    token = f.encrypt(plaintext.encode("utf-8")).decode("utf-8")
+    if profile is None:
+        return token
+    return get_profile(profile).spec() + KDF_SEPARATOR + token
 
 
 def decrypt_message(email: str, personal_string: str, encrypted_text: str) -> str:
     """
     Розшифровує base64-рядок, повертає звичайний текст.
     """
-    f = create_fernet_from_user_data(email, personal_string)
-    decrypted_bytes = f.decrypt(encrypted_text.encode("utf-8"))
+    profile, token = split_kdf(encrypted_text)
+    f = create_fernet_from_user_data(email, personal_string, profile=profile)
+    decrypted_bytes = f.decrypt(token.encode("utf-8"))
     return decrypted_bytes.decode("utf-8")
 
 
-def encrypt_file(email: str, personal_string: str, file_path: str) -> bytes:
+def encrypt_file(email: str, personal_string: str, file_path: str, profile=None) -> bytes:
     """
     Просте шифрування файлового вкладення. Повертає зашифровані байти.
     """
-    f = create_fernet_from_user_data(email, personal_string)
+    f = create_fernet_from_user_data(email, personal_string, profile=profile)
     with open(file_path, "rb") as f_in:
         data = f_in.read()
     token = f.encrypt(data)
-    return token
+    if profile is None:
+        return token
+    return (get_profile(profile).spec() + KDF_SEPARATOR).encode("ascii") + token
 
 
 def decrypt_file(email: str, personal_string: str, encrypted_data: bytes, output_path: str) -> None:
     """
     Розшифровує зашифровані байти файлу і зберігає у output_path.
     """
-    f = create_fernet_from_user_data(email, personal_string)
-    decrypted = f.decrypt(encrypted_data)
+    spec, sep, token = encrypted_data.rpartition(KDF_SEPARATOR.encode("ascii"))
+    profile = KdfProfile.parse(spec.decode("ascii")) if sep else DEFAULT_PROFILE
+    f = create_fernet_from_user_data(email, personal_string, profile=profile)
+    decrypted = f.decrypt(token)
     with open(output_path, "wb") as f_out:
         f_out.write(decrypted)
 
@@ -164,6 +409,7 @@ def main_menu():
             demo_exchange()
 
         elif choice == "4":
+            DEFAULT_KEYRING.clear()
             print("Вихід...")
             break
 
@@ -0,0 +1,205 @@
+"""
+Потокове шифрування великих вкладень фрагментами (AES-256-GCM).
+
+Fernet шифрує все повідомлення одним токеном у base64, тому файл доводиться
+тримати в пам'яті повністю. Тут файл обробляється фрагментами фіксованого
+розміру, пам'ять не залежить від розміру файлу, а результат — сирі байти.
+
+Формат (схема STREAM):
+    заголовок: MAGIC(6) | версія(1) | chunk_size(4, BE) | salt(16) | nonce_prefix(7)
+               | довжина spec KDF(1) | spec KDF (лише у версії 2)
+    далі фрагменти: AES-GCM(фрагмент) + тег(16)
+
+* ключ файлу = HKDF-SHA256(ключ KDF користувача, salt) — окремий для кожного файлу;
+  параметри KDF записані в заголовку (версія 1 — профіль за замовчуванням);
+* nonce = nonce_prefix | номер фрагмента (4, BE) | ознака останнього (1),
+  тож переставляння, дублювання чи відкидання фрагментів виявляється;
+* заголовок входить в associated data кожного фрагмента.
+Усі фрагменти, крім останнього, мають рівно chunk_size байт відкритого тексту.
+"""
+import os
+import struct
+from typing import BinaryIO
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from main import DEFAULT_KEYRING, DEFAULT_PROFILE, KdfProfile, decrypt_file, encrypt_file, get_profile
+
+MAGIC = b"L5STRM"
+VERSION = 2
+HEADER = struct.Struct(">6sBI16s7s")
+TAG_SIZE = 16
+STREAM_CHUNK_SIZE = 1 << 20          # 1 МБ відкритого тексту на фрагмент
+STREAM_THRESHOLD = 4 * 1024 * 1024   # менші вкладення шифруються звичайним Fernet
+MAX_CHUNK_COUNT = 1 << 32
+MAX_CHUNK_SIZE = 64 * 1024 * 1024    # більший фрагмент із заголовка вважається пошкодженням
+
+
+class StreamFormatError(ValueError):
+    """Пошкоджений, підроблений або обрізаний потік."""
+
+
+def _file_key(master_key: bytes, salt: bytes) -> AESGCM:
+    # Порожній чи обрізаний ключ дав би ключ файлу, обчислюваний із самого заголовка
+    if len(master_key) != 32:
+        raise ValueError("Некоректний ключ KDF: потрібно 32 байти")
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"lab05 stream v1").derive(master_key)
+    return AESGCM(key)
+
+
+def _nonce(prefix: bytes, index: int, final: bool) -> bytes:
+    if index >= MAX_CHUNK_COUNT:
+        raise StreamFormatError("Забагато фрагментів для одного потоку")
+    return prefix + struct.pack(">IB", index, 1 if final else 0)
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Читає до size байт (менше — лише в кінці потоку)."""
+    parts = []
+    while size:
+        data = stream.read(size)
+        if not data:
+            break
+        parts.append(data)
+        size -= len(data)
+    return b"".join(parts)
+
+
+def encrypt_stream(master_key: bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE,
+                   profile: KdfProfile = DEFAULT_PROFILE) -> int:
+    """
+    Шифрує потік src у dst. Повертає кількість байт відкритого тексту.
+    profile — профіль KDF, яким виведено master_key (записується в заголовок).
+    """
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError("Некоректний розмір фрагмента")
+    spec = profile.spec().encode("ascii")
+    salt, prefix = os.urandom(16), os.urandom(7)
+    header = HEADER.pack(MAGIC, VERSION, chunk_size, salt, prefix) + bytes([len(spec)]) + spec
+    aead = _file_key(master_key, salt)
+    dst.write(header)
+
+    total = index = 0
+    current = _read_exact(src, chunk_size)
+    while True:
+        # Попереднє читання наступного фрагмента визначає, чи поточний останній
+        following = _read_exact(src, chunk_size) if len(current) == chunk_size else b""
+        final = not following
+        dst.write(aead.encrypt(_nonce(prefix, index, final), current, header))
+        total += len(current)
+        if final:
+            return total
+        current = following
+        index += 1
+
+
+def read_header(src: BinaryIO) -> tuple:
+    """Читає заголовок: (байти заголовка, chunk_size, salt, nonce_prefix, профіль KDF)."""
+    header = _read_exact(src, HEADER.size)
+    if len(header) < HEADER.size:
+        raise StreamFormatError("Потік занадто короткий")
+    magic, version, chunk_size, salt, prefix = HEADER.unpack(header)
+    if magic != MAGIC or version not in (1, 2):
+        raise StreamFormatError("Невідомий формат потоку")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise StreamFormatError(f"Некоректний розмір фрагмента: {chunk_size}")
+    profile = DEFAULT_PROFILE
+    if version == 2:
+        length = _read_exact(src, 1)
+        spec = _read_exact(src, length[0]) if length else b""
+        if not length or len(spec) < length[0]:
+            raise StreamFormatError("Потік занадто короткий")
+        try:
+            profile = KdfProfile.parse(spec.decode("ascii"))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise StreamFormatError(f"Некоректні параметри KDF: {e}") from None
+        header += length + spec
+    return header, chunk_size, salt, prefix, profile
+
+
+def decrypt_stream(master_key: bytes, src: BinaryIO, dst: BinaryIO, header: tuple = None) -> int:
+    """
+    Розшифровує потік src у dst. Повертає кількість байт відкритого тексту.
+    header — результат read_header, якщо заголовок уже прочитано (щоб дізнатися профіль KDF).
+    """
+    header, chunk_size, salt, prefix, _ = header or read_header(src)
+    aead = _file_key(master_key, salt)
+    block = chunk_size + TAG_SIZE
+
+    total = index = 0
+    current = _read_exact(src, block)
+    while True:
+        following = _read_exact(src, block) if len(current) == block else b""
+        final = not following
+        if len(current) < TAG_SIZE:
+            raise StreamFormatError("Обрізаний фрагмент")
+        try:
+            plain = aead.decrypt(_nonce(prefix, index, final), current, header)
+        except InvalidTag:
+            raise StreamFormatError(f"Фрагмент {index}: автентифікація не пройдена "
+                                    "(невірний ключ, підробка або обрізаний файл)") from None
+        dst.write(plain)
+        total += len(plain)
+        if final:
+            return total
+        current = following
+        index += 1
+
+
+def encrypt_file_stream(email: str, personal_string: str, input_path: str, output_path: str,
+                        chunk_size: int = STREAM_CHUNK_SIZE, profile=None) -> int:
+    profile = get_profile(profile)
+    master_key = DEFAULT_KEYRING.master_key(email, personal_string, profile)
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        return encrypt_stream(master_key, src, dst, chunk_size, profile)
+
+
+def decrypt_file_stream(email: str, personal_string: str, input_path: str, output_path: str) -> int:
+    """
+    Розшифровує у тимчасовий файл і перейменовує лише після перевірки всіх
+    фрагментів, тож неавтентифіковані дані не з'являються під output_path.
+    """
+    partial = output_path + ".part"
+    try:
+        with open(input_path, "rb") as src, open(partial, "wb") as dst:
+            header = read_header(src)
+            master_key = DEFAULT_KEYRING.master_key(email, personal_string, header[4])
+            total = decrypt_stream(master_key, src, dst, header)
+        os.replace(partial, output_path)
+        return total
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def is_stream_file(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def encrypt_attachment(email: str, personal_string: str, input_path: str, output_path: str,
+                       threshold: int = STREAM_THRESHOLD, profile=None) -> str:
+    """
+    Малі вкладення — Fernet-токен (як encrypt_file), великі — потоковий формат.
+    Повертає використаний формат: "fernet" або "stream".
+    """
+    if os.path.getsize(input_path) < threshold:
+        token = encrypt_file(email, personal_string, input_path, profile)
+        with open(output_path, "wb") as f_out:
+            f_out.write(token)
+        return "fernet"
+    encrypt_file_stream(email, personal_string, input_path, output_path, profile=profile)
+    return "stream"
+
+
+def decrypt_attachment(email: str, personal_string: str, input_path: str, output_path: str) -> str:
+    """Розшифровує вкладення будь-якого з двох форматів (визначається за заголовком)."""
+    if is_stream_file(input_path):
+        decrypt_file_stream(email, personal_string, input_path, output_path)
+        return "stream"
+    with open(input_path, "rb") as f_in:
+        decrypt_file(email, personal_string, f_in.read(), output_path)
+    return "fernet"